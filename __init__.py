@@ -12,18 +12,39 @@ bl_info = {
 
 import bpy
 
-# Импортируем модули с помощью полных путей
+# Импортируем модули с помощью полных путей. Зависимости перезагружаются
+# раньше модулей, которые их импортируют, иначе те сохранят старые объекты
 if "operators" in locals():
     import importlib
+    importlib.reload(constants)
+    importlib.reload(profiling)
+    importlib.reload(snapshot)
+    importlib.reload(bakers)
+    importlib.reload(eligibility)
+    importlib.reload(state)
+    importlib.reload(trace)
+    importlib.reload(tracker)
+    importlib.reload(apply)
+    importlib.reload(apply_queue)
+    importlib.reload(normalize)
+    importlib.reload(utils)
     importlib.reload(operators)
     importlib.reload(panels)
-    importlib.reload(utils)
-    importlib.reload(constants)
 else:
+    from . import constants
+    from . import profiling
+    from . import snapshot
+    from . import bakers
+    from . import eligibility
+    from . import state
+    from . import trace
+    from . import tracker
+    from . import apply
+    from . import apply_queue
+    from . import normalize
+    from . import utils
     from . import operators
     from . import panels
-    from . import utils
-    from . import constants
 
 from .constants import OBJECT_TYPES
 
@@ -31,6 +52,10 @@ classes = [
     operators.AutoApplyScaleOperator,
     operators.AutoApplySelectCategoryOperator,
     operators.AutoApplyDeselectCategoryOperator,
+    operators.AutoApplyExportProfileOperator,
+    operators.AutoApplyResetProfileOperator,
+    operators.AutoApplyCancelQueueOperator,
+    operators.AutoApplyNormalizeSceneOperator,
     panels.AutoApplyScalePanel
 ]
 
@@ -60,45 +85,167 @@ def register():
         default=True
     )
 
+    # Пакетное применение: один вызов оператора на все измененные объекты
+    bpy.types.Scene.auto_apply_batch_mode = bpy.props.BoolProperty(
+        name="Batch Apply",
+        description="Применять масштаб ко всем измененным объектам за один проход",
+        default=True
+    )
+
+    # Прямое запекание масштаба в данные без bpy.ops.object.transform_apply
+    bpy.types.Scene.auto_apply_fast_bake = bpy.props.BoolProperty(
+        name="Fast Bake",
+        description="Запекать масштаб напрямую в данные объекта, если для его типа есть быстрый бэкенд",
+        default=True
+    )
+
+    # Порог вершин для запекания больших мешей по частям
+    bpy.types.Scene.auto_apply_large_mesh_threshold = bpy.props.IntProperty(
+        name="Large Mesh Threshold",
+        description="Меши с таким числом вершин и больше масштабируются по частям в нескольких потоках без полной копии координат",
+        default=bakers.LARGE_MESH_THRESHOLD,
+        min=1000
+    )
+
+    # Способ отслеживания изменений масштаба
+    bpy.types.Scene.auto_apply_change_detection = bpy.props.EnumProperty(
+        name="Change Detection",
+        description="Как отслеживать изменения масштаба между подтверждениями",
+        items=constants.CHANGE_DETECTION_MODES,
+        default='DEPSGRAPH'
+    )
+
+    # Поэтапное применение больших выделений через bpy.app.timers
+    bpy.types.Scene.auto_apply_chunked = bpy.props.BoolProperty(
+        name="Chunked Apply",
+        description="Применять масштаб к большим выделениям порциями, не блокируя интерфейс",
+        default=False
+    )
+    bpy.types.Scene.auto_apply_chunk_threshold = bpy.props.IntProperty(
+        name="Chunk Threshold",
+        description="Минимальное число измененных объектов для поэтапного применения",
+        default=500,
+        min=1
+    )
+    bpy.types.Scene.auto_apply_slice_ms = bpy.props.FloatProperty(
+        name="Slice Budget",
+        description="Бюджет времени одной порции в миллисекундах",
+        default=8.0,
+        min=1.0,
+        max=100.0
+    )
+    bpy.types.Scene.auto_apply_queue_conflict = bpy.props.EnumProperty(
+        name="Queue Conflict",
+        description="Что делать с необработанной очередью при новом подтверждении",
+        items=constants.QUEUE_CONFLICT_MODES,
+        default='MERGE'
+    )
+
+    # Шаг отмены для применений одного подтверждения
+    bpy.types.Scene.auto_apply_undo_mode = bpy.props.EnumProperty(
+        name="Undo Mode",
+        description="Как применения одного подтверждения записываются в историю отмены",
+        items=constants.UNDO_MODES,
+        default='SEPARATE'
+    )
+
+    # Коллекция для нормализации масштаба
+    bpy.types.Scene.auto_apply_normalize_collection = bpy.props.PointerProperty(
+        name="Normalize Collection",
+        description="Коллекция, объекты которой нормализует кнопка «Коллекция»",
+        type=bpy.types.Collection
+    )
+
+    # Профилирование фаз работы оператора
+    bpy.types.Scene.auto_apply_profiling_enabled = bpy.props.BoolProperty(
+        name="Profiling",
+        description="Собирать статистику времени по фазам работы оператора",
+        default=False,
+        update=utils.update_profiling_enabled
+    )
+    # Запись трассы событий оператора для воспроизведения вне Blender
+    bpy.types.Scene.auto_apply_trace_enabled = bpy.props.BoolProperty(
+        name="Record Trace",
+        description="Записывать события оператора, выделение и масштабы в файл трассы",
+        default=False,
+        update=utils.update_trace_enabled
+    )
+    bpy.types.Scene.auto_apply_trace_path = bpy.props.StringProperty(
+        name="Trace Path",
+        description="Файл трассы в формате JSON Lines",
+        default="//auto_apply_trace.jsonl",
+        subtype='FILE_PATH'
+    )
+    bpy.types.Scene.auto_apply_show_profiling = bpy.props.BoolProperty(
+        name="Показать профилирование",
+        description="Показать/скрыть статистику профилирования",
+        default=False
+    )
+
     # Добавляем свойства для типов объектов
     for obj_type, _, _ in OBJECT_TYPES:
         setattr(bpy.types.Scene, f"auto_apply_{obj_type.lower()}", 
                 bpy.props.BoolProperty(
                     name=f"Apply to {obj_type}",
                     description=f"Применять к объектам типа {obj_type}",
-                    default=obj_type == 'MESH'  # По умолчанию включен только MESH
+                    default=obj_type == 'MESH',  # По умолчанию включен только MESH
+                    update=utils.update_enabled_types
                 ))
     
-    # Автозапуск с очисткой предыдущих данных
-    def auto_start():
-        try:
-            if bpy.context.mode == 'OBJECT':
-                # Сбрасываем статус текущих запущенных операторов
-                # Это решает проблему с повторным включением аддона
-                utils.reset_auto_apply_scale_status()
-                
-                # Запускаем оператор
-                utils.update_auto_apply_scale(bpy.context.scene, bpy.context)
-        except Exception:
-            pass
-        return None
-    
-    bpy.app.timers.register(auto_start, first_interval=1.0)
+    # Сбрасываем реестр трекеров прежней регистрации аддона
+    # Это решает проблему с повторным включением аддона
+    utils.reset_auto_apply_scale_status()
+
+    # Трекеры запускаются, как только появятся окна; в фоновом режиме не запускаются
+    tracker.tracker_registry.start_when_ready('register')
 
     # Перезапуск оператора после загрузки .blend файла
     bpy.app.handlers.load_post.append(utils.auto_apply_scale_load_post)
 
+    # Кэш включенных типов сбрасывается при отмене/повторе действия
+    bpy.app.handlers.undo_post.append(utils.auto_apply_scale_undo_post)
+    bpy.app.handlers.redo_post.append(utils.auto_apply_scale_undo_post)
+
+    # Отслеживание изменений масштаба по событиям depsgraph
+    bpy.app.handlers.depsgraph_update_post.append(utils.auto_apply_scale_depsgraph_update)
+
 def unregister():
+    apply_queue.apply_queue.cancel()
+    trace.trace_recorder.stop()
+    tracker.tracker_registry.clear()
+    for timer in (tracker._sync_timer, tracker._ready_timer):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
     # Удаляем load_post хэндлер
     if utils.auto_apply_scale_load_post in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(utils.auto_apply_scale_load_post)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if utils.auto_apply_scale_undo_post in handlers:
+            handlers.remove(utils.auto_apply_scale_undo_post)
+    if utils.auto_apply_scale_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(utils.auto_apply_scale_depsgraph_update)
 
     del bpy.types.Scene.auto_apply_scale_enabled
     del bpy.types.Scene.auto_apply_show_object_types
     del bpy.types.Scene.auto_apply_scale
+    del bpy.types.Scene.auto_apply_batch_mode
+    del bpy.types.Scene.auto_apply_fast_bake
+    del bpy.types.Scene.auto_apply_large_mesh_threshold
+    del bpy.types.Scene.auto_apply_change_detection
+    del bpy.types.Scene.auto_apply_profiling_enabled
+    del bpy.types.Scene.auto_apply_chunked
+    del bpy.types.Scene.auto_apply_chunk_threshold
+    del bpy.types.Scene.auto_apply_slice_ms
+    del bpy.types.Scene.auto_apply_queue_conflict
+    del bpy.types.Scene.auto_apply_undo_mode
+    del bpy.types.Scene.auto_apply_normalize_collection
+    del bpy.types.Scene.auto_apply_show_profiling
+    del bpy.types.Scene.auto_apply_trace_enabled
+    del bpy.types.Scene.auto_apply_trace_path
     
     # Удаляем свойства для типов объектов
     for obj_type, _, _ in OBJECT_TYPES:
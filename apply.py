@@ -0,0 +1,143 @@
+import bpy
+from typing import Dict, Iterable, List, Tuple
+from . import bakers
+from .state import object_key, is_object_valid
+from .profiling import profiler
+
+
+# Название шага отмены, общего для всех применений одного подтверждения
+UNDO_STEP_NAME = "Auto Apply Scale"
+
+
+def sort_by_hierarchy(objects: Iterable[bpy.types.Object]) -> List[bpy.types.Object]:
+    """Сортирует объекты так, что родители идут раньше потомков.
+
+    Глубина каждого объекта вычисляется один раз с запоминанием по цепочке
+    родителей, поэтому стоимость линейна по числу узлов иерархии.
+    """
+    depths: Dict[int, int] = {}
+
+    def depth_of(obj) -> int:
+        chain = []
+        node = obj
+        while node is not None and object_key(node) not in depths:
+            chain.append(node)
+            node = node.parent
+        depth = -1 if node is None else depths[object_key(node)]
+        for node in reversed(chain):
+            depth += 1
+            depths[object_key(node)] = depth
+        return depths[object_key(obj)]
+
+    return sorted(objects, key=depth_of)
+
+
+def group_by_shared_data(objects: Iterable[bpy.types.Object]) -> List[List[bpy.types.Object]]:
+    """Разбивает объекты на неделимые единицы обработки.
+
+    Пользователи одного общего datablock попадают в одну единицу на месте
+    первого из них, остальные объекты идут по одному. Порции, собранные из
+    целых единиц, не делят группу общих данных, и она запекается один раз.
+    """
+    units = []
+    shared: Dict[int, List[bpy.types.Object]] = {}
+    for obj in objects:
+        data = obj.data
+        if data is None or bakers.data_users(data) <= 1:
+            units.append([obj])
+            continue
+        unit = shared.get(data.session_uid)
+        if unit is None:
+            unit = shared[data.session_uid] = []
+            units.append(unit)
+        unit.append(obj)
+    return units
+
+
+def filter_targets(objects: Iterable[bpy.types.Object], enabled_types) -> List[bpy.types.Object]:
+    """Отбирает валидные объекты включенных типов с масштабом, отличным от (1.0, 1.0, 1.0)"""
+    return [obj for obj in objects
+            if is_object_valid(obj)
+            and obj.type in enabled_types
+            and not bakers.is_unit_scale(obj.scale)]
+
+
+def apply_scale(context, targets: List[bpy.types.Object], use_fast_bake: bool = True) -> Tuple[int, List[str]]:
+    """Применяет масштаб ко всем объектам за один проход.
+
+    Сначала масштаб запекается напрямую в данные, для остальных объектов
+    выполняется один вызов transform_apply. Выделение сохраняется и
+    восстанавливается один раз на весь набор, поэтому стоимость зависит от
+    размера выделения, а не от числа объектов в сцене.
+    Возвращает количество обработанных объектов и список ошибок.
+    """
+    errors = []
+    if not targets:
+        return 0, errors
+
+    targets = sort_by_hierarchy(targets)
+    fallback = targets
+    if use_fast_bake:
+        # Без регистрации аддона (batch_cli) свойства сцены нет
+        bakers.set_large_mesh_threshold(getattr(context.scene, 'auto_apply_large_mesh_threshold',
+                                                bakers.LARGE_MESH_THRESHOLD))
+        try:
+            with profiler.phase('fast_bake'):
+                fallback = bakers.bake_objects(targets)
+            profiler.add_objects('fast_bake', len(targets) - len(fallback))
+        except Exception as e:
+            errors.append(f"Ошибка запекания масштаба: {str(e)}")
+            fallback = [obj for obj in targets
+                        if is_object_valid(obj) and not bakers.is_unit_scale(obj.scale)]
+    if not fallback:
+        return len(targets), errors
+
+    # Сохраняем только текущее выделение, а не состояние всех объектов слоя
+    view_layer = context.view_layer
+    previously_selected = [o for o in context.selected_objects if is_object_valid(o)]
+    active_object = view_layer.objects.active
+
+    try:
+        with profiler.phase('selection_save'):
+            for o in previously_selected:
+                o.select_set(False)
+            for obj in fallback:
+                obj.select_set(True)
+            view_layer.objects.active = fallback[0]
+
+        # Применяем только масштаб, один вызов на весь набор. Общие данные
+        # разделяются, иначе один такой объект прерывает применение для всех
+        with profiler.phase('transform_apply'):
+            bpy.ops.object.transform_apply(
+                'EXEC_DEFAULT', False,
+                location=False,
+                rotation=False,
+                scale=True,
+                isolate_users=True
+            )
+        profiler.add_objects('transform_apply', len(fallback))
+    except Exception as e:
+        errors.append(f"Ошибка применения масштаба: {str(e)}")
+    finally:
+        # Восстанавливаем прежнее выделение
+        with profiler.phase('selection_restore'):
+            for obj in fallback:
+                if is_object_valid(obj):
+                    obj.select_set(False)
+            for o in previously_selected:
+                if is_object_valid(o):
+                    o.select_set(True)
+            view_layer.objects.active = active_object
+
+    return len(targets), errors
+
+
+def push_undo_step(context):
+    """Записывает применения одного подтверждения одним шагом отмены.
+
+    В режиме SEPARATE шаг добавляется после применения, и Ctrl+Z отменяет
+    только применение масштаба. В режиме MERGED шаг не добавляется: Ctrl+Z
+    возвращает состояние до изменения масштаба вместе с применением.
+    """
+    if context.scene.auto_apply_undo_mode == 'SEPARATE':
+        bpy.ops.ed.undo_push(message=UNDO_STEP_NAME)
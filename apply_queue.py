@@ -0,0 +1,233 @@
+import time
+import bpy
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from . import apply, bakers
+from .state import object_key, is_object_valid
+from .profiling import profiler
+from .tracker import tracker_registry
+
+# Пауза между порциями, чтобы интерфейс успевал обрабатывать события
+SLICE_INTERVAL = 0.001
+# Начальная оценка стоимости одного объекта до первого замера, в секундах
+INITIAL_OBJECT_COST = 0.0005
+# Интервал проверки, пока в очереди остались только отложенные объекты, в секундах
+DEFER_INTERVAL = 0.05
+# Сколько ждать возврата отложенного объекта к ожидаемому масштабу, в секундах
+DEFER_TIMEOUT = 60.0
+
+
+class ApplyQueue:
+    """Очередь поэтапного применения масштаба через bpy.app.timers.
+
+    Объекты обрабатываются порциями, каждая из которых укладывается в бюджет
+    времени, поэтому интерфейс не замирает на больших выделениях. Для каждого
+    объекта запоминается масштаб на момент постановки в очередь: если к началу
+    обработки масштаб уже другой (пользователь начал новую трансформацию),
+    объект откладывается до следующей порции. Подтверждение трансформации
+    обновит ожидаемый масштаб, отмена вернет прежний, и объект будет применен.
+    Объект, не вернувшийся к ожидаемому масштабу за DEFER_TIMEOUT, снимается
+    с очереди, а снимки трекеров для него сбрасываются, чтобы его подхватило
+    следующее подтверждение.
+    Все порции одной очереди записываются одним шагом отмены после
+    обработки последней порции. Пользователи одного общего datablock хранятся
+    одной единицей очереди и не разделяются между порциями.
+    """
+    __slots__ = ('pending', 'shared_units', 'expected', 'deferred_since', 'total', 'done', 'applied',
+                 'dropped', 'window', 'use_fast_bake', 'push_undo', 'budget', 'object_cost', 'errors')
+
+    def __init__(self):
+        # Единицы обработки: (session_uid общих данных или None, список (ключ, объект))
+        self.pending = deque()
+        # Ожидающие единицы общих данных по session_uid datablock
+        self.shared_units: Dict[int, list] = {}
+        self.expected: Dict[int, Tuple[float, float, float]] = {}
+        # Время первого откладывания объекта по ключу
+        self.deferred_since: Dict[int, float] = {}
+        self.total = 0
+        self.done = 0
+        self.applied = 0
+        self.dropped = 0
+        self.window = None
+        self.use_fast_bake = True
+        self.push_undo = True
+        self.budget = 0.008
+        self.object_cost = INITIAL_OBJECT_COST
+        self.errors: List[str] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.pending)
+
+    def enqueue(self, context, objects: List[bpy.types.Object], budget_ms: float, use_fast_bake: bool,
+                push_undo: bool = True):
+        """Добавляет объекты в очередь, объединяя их с еще не обработанными"""
+        self.window = context.window
+        self.use_fast_bake = use_fast_bake
+        self.push_undo = push_undo
+        self.budget = max(0.001, budget_ms / 1000.0)
+        if not self.pending:
+            self.total = 0
+            self.done = 0
+            self.applied = 0
+            self.dropped = 0
+            self.errors.clear()
+
+        for obj in objects:
+            key = object_key(obj)
+            if key not in self.expected:
+                self._append(key, obj)
+                self.total += 1
+            # Повторно измененный объект применяется с последним масштабом
+            self.expected[key] = tuple(obj.scale)
+
+        if self.pending and not bpy.app.timers.is_registered(self._tick):
+            bpy.app.timers.register(self._tick, first_interval=0.0)
+        self._update_progress()
+
+    def _append(self, key: int, obj: bpy.types.Object):
+        """Добавляет объект в очередь; пользователь общих данных дополняет их единицу"""
+        data = obj.data
+        if data is None or bakers.data_users(data) <= 1:
+            self.pending.append((None, [(key, obj)]))
+            return
+        unit = self.shared_units.get(data.session_uid)
+        if unit is None:
+            unit = self.shared_units[data.session_uid] = []
+            self.pending.append((data.session_uid, unit))
+        unit.append((key, obj))
+
+    def cancel(self) -> int:
+        """Очищает очередь и возвращает число необработанных объектов"""
+        remaining = sum(len(unit) for _, unit in self.pending)
+        self.pending.clear()
+        self.shared_units.clear()
+        self.expected.clear()
+        self.deferred_since.clear()
+        if bpy.app.timers.is_registered(self._tick):
+            bpy.app.timers.unregister(self._tick)
+        self._update_progress()
+        return remaining
+
+    def _take_slice(self) -> Tuple[List[bpy.types.Object], List[bpy.types.Object]]:
+        """Забирает из очереди порцию объектов для применения.
+
+        Возвращает порцию и объекты, снятые с очереди по DEFER_TIMEOUT.
+        Единицы с измененным масштабом возвращаются в конец очереди целиком.
+        """
+        count = max(1, int(self.budget / self.object_cost))
+        chunk = []
+        dropped = []
+        deferred = []
+        now = time.perf_counter()
+        while self.pending and len(chunk) < count:
+            data_key, unit = self.pending.popleft()
+            if data_key is not None:
+                del self.shared_units[data_key]
+            live = []
+            for key, obj in unit:
+                if is_object_valid(obj) and key in self.expected:
+                    live.append((key, obj))
+                else:
+                    self._finish_object(key)
+            if not any(self._scale_moved(key, obj) for key, obj in live):
+                for key, obj in live:
+                    self._finish_object(key)
+                    chunk.append(obj)
+                continue
+            since = min(self.deferred_since.setdefault(key, now) for key, _ in live)
+            if now - since < DEFER_TIMEOUT:
+                deferred.append((data_key, live))
+                continue
+            for key, obj in live:
+                self._finish_object(key)
+                dropped.append(obj)
+
+        for data_key, unit in deferred:
+            if data_key is not None:
+                self.shared_units[data_key] = unit
+            self.pending.append((data_key, unit))
+        self.dropped += len(dropped)
+        return chunk, dropped
+
+    def _scale_moved(self, key: int, obj: bpy.types.Object) -> bool:
+        """Отличается ли масштаб объекта от ожидаемого при постановке в очередь"""
+        return any(abs(a - b) > 1e-6 for a, b in zip(obj.scale, self.expected[key]))
+
+    def _finish_object(self, key: int):
+        """Снимает объект с учета очереди"""
+        self.expected.pop(key, None)
+        self.deferred_since.pop(key, None)
+        self.done += 1
+
+    def _tick(self) -> Optional[float]:
+        start = time.perf_counter()
+        chunk, dropped = self._take_slice()
+        if dropped:
+            # Снимки сделаны по масштабу при постановке в очередь: без сброса
+            # объект, вернувшийся к этому масштабу, больше не будет применен
+            for tracker in tracker_registry.live():
+                tracker.rollback_snapshots(dropped)
+        if chunk:
+            with profiler.phase('queue_slice'):
+                if self.window is not None:
+                    with bpy.context.temp_override(window=self.window):
+                        _, errors = apply.apply_scale(bpy.context, chunk, self.use_fast_bake)
+                        scene = bpy.context.scene
+                else:
+                    _, errors = apply.apply_scale(bpy.context, chunk, self.use_fast_bake)
+                    scene = bpy.context.scene
+                # Снимки трекеров сделаны до применения: без обновления следующее
+                # подтверждение приняло бы примененные объекты за измененные
+                for tracker in tracker_registry.for_scene(scene):
+                    tracker.refresh_snapshots(chunk)
+            profiler.add_objects('queue_slice', len(chunk))
+            self.applied += len(chunk)
+            self.errors.extend(errors)
+            for line in bakers.drain_large_mesh_log():
+                print(f"Auto Apply Scale: {line}")
+            # Скользящая оценка стоимости объекта для размера следующей порции
+            cost = (time.perf_counter() - start) / len(chunk)
+            self.object_cost = 0.5 * self.object_cost + 0.5 * cost
+
+        self._update_progress()
+        if self.pending:
+            # Без порции в очереди остались только отложенные объекты
+            return SLICE_INTERVAL if chunk else DEFER_INTERVAL
+        for error in self.errors:
+            print(f"Auto Apply Scale: {error}")
+        if self.dropped:
+            print(f"Auto Apply Scale: не применено объектов: {self.dropped} "
+                  f"(масштаб изменился после постановки в очередь)")
+        self.expected.clear()
+        if self.push_undo and self.applied:
+            self._push_undo_step()
+        return None
+
+    def _push_undo_step(self):
+        if self.window is not None:
+            with bpy.context.temp_override(window=self.window):
+                bpy.ops.ed.undo_push(message=apply.UNDO_STEP_NAME)
+        else:
+            bpy.ops.ed.undo_push(message=apply.UNDO_STEP_NAME)
+
+    def _update_progress(self):
+        """Показывает прогресс в строке состояния и перерисовывает панель"""
+        show_status(f"Auto Apply Scale: {self.done}/{self.total}" if self.pending else None)
+
+
+def show_status(text: Optional[str]):
+    """Показывает text в строке состояния (None убирает его) и перерисовывает 3D-виды"""
+    wm = bpy.context.window_manager
+    if wm is None:
+        return
+    for window in wm.windows:
+        if window.workspace is not None:
+            window.workspace.status_text_set(text)
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+# Общая очередь аддона
+apply_queue = ApplyQueue()
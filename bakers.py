@@ -0,0 +1,603 @@
+import bpy
+import ctypes
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+from .profiling import profiler, current_rss_bytes
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Допуск, в пределах которого масштаб считается единичным
+UNIT_SCALE_EPSILON = 1e-6
+# Точность округления, с которой масштабы пользователей общих данных считаются равными
+SHARED_SCALE_DIGITS = 5
+# Число вершин, начиная с которого меш масштабируется по частям без полной копии
+LARGE_MESH_THRESHOLD = 2_000_000
+# Вершин в одной части большого меша (около 3 МБ координат float32)
+LARGE_MESH_CHUNK = 1 << 18
+# Потоки для масштабирования частей: numpy отпускает GIL на умножении
+LARGE_MESH_WORKERS = max(1, min(8, os.cpu_count() or 1))
+# Типы ручек Безье, которые transform_apply вычисляет заново (BKE_nurb_handles_calc)
+CALCULATED_HANDLE_TYPES = frozenset(('AUTO', 'AUTO_CLAMPED', 'VECTOR'))
+
+# Последние замеры запекания больших мешей для отчета оператора
+large_mesh_log: deque = deque(maxlen=32)
+# Заранее собранные потомки объектов (session_uid -> список) на время массовой обработки
+_children_map: Optional[Dict[int, list]] = None
+
+
+def is_unit_scale(scale: Sequence[float]) -> bool:
+    """Проверяет, что масштаб равен (1.0, 1.0, 1.0) с учетом допуска"""
+    return all(abs(s - 1.0) < UNIT_SCALE_EPSILON for s in scale)
+
+
+def is_uniform_scale(scale: Sequence[float]) -> bool:
+    """Проверяет, что модули компонент масштаба равны с учетом допуска"""
+    first = abs(scale[0])
+    return all(abs(abs(s) - first) < UNIT_SCALE_EPSILON for s in scale)
+
+
+def has_calculated_handles(curve: bpy.types.Curve) -> bool:
+    """Есть ли у кривой ручки Безье, которые Blender вычисляет сам"""
+    return any(point.handle_left_type in CALCULATED_HANDLE_TYPES
+               or point.handle_right_type in CALCULATED_HANDLE_TYPES
+               for spline in curve.splines for point in spline.bezier_points)
+
+
+def uniform_scale(scale: 'np.ndarray') -> float:
+    """Скалярный масштаб для радиусов, как mat3_to_scale в Blender"""
+    import numpy as np
+    return float(np.sqrt(np.mean(np.square(scale, dtype=np.float64))))
+
+
+def scale_attribute(collection, attr: str, scale: 'np.ndarray', width: int = 3):
+    """Умножает первые три компоненты векторного атрибута коллекции на scale"""
+    import numpy as np
+    values = np.empty(len(collection) * width, dtype=np.float32)
+    collection.foreach_get(attr, values)
+    values.reshape(-1, width)[:, :3] *= scale
+    collection.foreach_set(attr, values)
+
+
+def vector_buffer_view(collection, width: int = 3, start: int = 0,
+                       stop: Optional[int] = None) -> Optional['np.ndarray']:
+    """Массив numpy поверх памяти векторного атрибута коллекции без копирования.
+
+    Вершины меша и точки ключей формы лежат в одном непрерывном массиве
+    float3, и as_pointer() элемента указывает на его координаты. Если адреса
+    первого, второго и последнего элементов диапазона [start, stop) не
+    подтверждают такую раскладку, возвращает None.
+    """
+    import numpy as np
+    if stop is None:
+        stop = len(collection)
+    count = stop - start
+    if count < 2:
+        return None
+    stride = width * ctypes.sizeof(ctypes.c_float)
+    base = collection[start].as_pointer()
+    if (not base
+            or collection[start + 1].as_pointer() != base + stride
+            or collection[stop - 1].as_pointer() != base + stride * (count - 1)):
+        return None
+    buffer = (ctypes.c_float * (count * width)).from_address(base)
+    return np.ctypeslib.as_array(buffer).reshape(count, width)
+
+
+def scale_attribute_chunked(collection, attr: str, scale: 'np.ndarray', executor: ThreadPoolExecutor):
+    """Умножает векторный атрибут на scale по частям прямо в памяти Blender.
+
+    Дополнительная память не выделяется. Если раскладка памяти всей коллекции
+    не подтверждена, используется scale_attribute_buffered.
+    """
+    import numpy as np
+    values = vector_buffer_view(collection)
+    if values is None:
+        scale_attribute_buffered(collection, attr, scale)
+        return
+
+    def scale_chunk(start: int):
+        part = values[start:start + LARGE_MESH_CHUNK]
+        np.multiply(part, scale, out=part)
+
+    for _ in executor.map(scale_chunk, range(0, len(values), LARGE_MESH_CHUNK)):
+        pass
+    # Запись через RNA помечает координаты измененными (кэши нормалей, границы)
+    first = collection[0]
+    setattr(first, attr, getattr(first, attr))
+
+
+def scale_attribute_buffered(collection, attr: str, scale: 'np.ndarray'):
+    """Умножает векторный атрибут на scale частями по LARGE_MESH_CHUNK элементов.
+
+    Часть с подтвержденной раскладкой памяти умножается на месте, остальные
+    читаются и записываются поэлементно через один буфер на часть. Копия
+    всего атрибута, как у foreach_get, не создается.
+    """
+    import numpy as np
+    count = len(collection)
+    buffer = None
+    for start in range(0, count, LARGE_MESH_CHUNK):
+        stop = min(start + LARGE_MESH_CHUNK, count)
+        view = vector_buffer_view(collection, start=start, stop=stop)
+        if view is not None:
+            np.multiply(view, scale, out=view)
+            continue
+        if buffer is None:
+            buffer = np.empty((min(LARGE_MESH_CHUNK, count), 3), dtype=np.float32)
+        part = buffer[:stop - start]
+        for row, index in enumerate(range(start, stop)):
+            part[row] = getattr(collection[index], attr)
+        part *= scale
+        for row, index in enumerate(range(start, stop)):
+            setattr(collection[index], attr, part[row])
+    if count:
+        # Запись через RNA помечает координаты измененными (кэши нормалей, границы)
+        first = collection[0]
+        setattr(first, attr, getattr(first, attr))
+
+
+def scale_scalar_attribute(collection, attr: str, factor: float):
+    """Умножает скалярный атрибут коллекции на factor"""
+    import numpy as np
+    values = np.empty(len(collection), dtype=np.float32)
+    collection.foreach_get(attr, values)
+    values *= factor
+    collection.foreach_set(attr, values)
+
+
+def build_children_map(objects) -> Dict[int, list]:
+    """Собирает потомков всех объектов за один проход"""
+    children_map = defaultdict(list)
+    for obj in objects:
+        parent = obj.parent
+        if parent is not None:
+            children_map[parent.session_uid].append(obj)
+    return children_map
+
+
+@contextmanager
+def use_children_map(children_map: Dict[int, list]):
+    """Подставляет собранных потомков вместо obj.children на время блока.
+
+    obj.children в Blender обходит все объекты файла, поэтому при обработке
+    всей сцены вызов на каждый объект дает квадратичную стоимость.
+    """
+    global _children_map
+    _children_map = children_map
+    try:
+        yield
+    finally:
+        _children_map = None
+
+
+def object_children(obj: bpy.types.Object):
+    """Потомки объекта из собранной карты или obj.children"""
+    if _children_map is not None:
+        return _children_map.get(obj.session_uid, ())
+    return obj.children
+
+
+def object_parented_children(obj: bpy.types.Object) -> bool:
+    """Проверяет, что все потомки привязаны к объекту целиком (parent_type OBJECT).
+
+    Положение таких потомков восстанавливается через matrix_parent_inverse,
+    привязку к вершинам и костям оставляем оператору.
+    """
+    return all(child.parent_type == 'OBJECT' for child in object_children(obj))
+
+
+class ScaleBaker:
+    """Базовый бэкенд запекания масштаба в данные объекта.
+
+    Бэкенд умножает геометрию на матрицу масштаба напрямую и сбрасывает
+    obj.scale в (1, 1, 1), минуя bpy.ops.object.transform_apply.
+    """
+    obj_type: str = ''
+
+    def can_bake(self, obj: bpy.types.Object, shared: bool = False) -> bool:
+        """Проверяет, что масштаб объекта можно запечь на уровне данных.
+
+        shared=True разрешает данные с несколькими пользователями: группировку
+        пользователей и разделение данных выполняет вызывающий код.
+        Потомки компенсирует compensate_children.
+        """
+        data = obj.data
+        return (data is not None
+                and obj.library is None
+                and obj.override_library is None
+                and data.library is None
+                and (shared or data.users == 1)
+                and object_parented_children(obj)
+                and is_unit_scale(obj.delta_scale))
+
+    def bake(self, obj: bpy.types.Object, scale: 'np.ndarray'):
+        """Запекает масштаб scale (массив float32 из трех компонент) в данные объекта"""
+        raise NotImplementedError
+
+    def bake_many(self, objects: List[bpy.types.Object]):
+        """Запекает масштаб каждого объекта и сбрасывает obj.scale"""
+        import numpy as np
+        for obj in objects:
+            self.bake(obj, np.array(obj.scale, dtype=np.float32))
+            obj.scale = (1.0, 1.0, 1.0)
+
+
+class MeshScaleBaker(ScaleBaker):
+    """Запекание масштаба для полигональных объектов через foreach_get/foreach_set.
+
+    Меши от large_mesh_threshold вершин масштабируются по частям в пуле
+    потоков прямо в памяти Blender, без полной копии координат.
+    """
+    obj_type = 'MESH'
+
+    def __init__(self):
+        self.large_mesh_threshold = LARGE_MESH_THRESHOLD
+
+    def can_bake(self, obj: bpy.types.Object, shared: bool = False) -> bool:
+        import numpy as np
+        if not super().can_bake(obj, shared):
+            return False
+        # Отражение с пользовательскими нормалями оставляем оператору:
+        # порядок углов после flip_normals не совпадает с исходным
+        if obj.data.has_custom_normals and np.prod(np.sign(obj.scale)) < 0:
+            return False
+        return True
+
+    def bake(self, obj: bpy.types.Object, scale: 'np.ndarray'):
+        mesh = obj.data
+        vertex_count = len(mesh.vertices)
+        if vertex_count < self.large_mesh_threshold:
+            self._bake_mesh(mesh, scale, scale_attribute)
+            return
+
+        buffer_bytes = self._large_mesh_buffer_bytes(mesh)
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        with profiler.phase('large_mesh_bake'), ThreadPoolExecutor(LARGE_MESH_WORKERS) as executor:
+            self._bake_mesh(mesh, scale,
+                            lambda collection, attr, s: scale_attribute_chunked(collection, attr, s, executor))
+        profiler.add_objects('large_mesh_bake', 1)
+        large_mesh_log.append({
+            'name': obj.name,
+            'vertices': vertex_count,
+            'ms': (time.perf_counter() - start) * 1000.0,
+            'rss_delta': None if rss_before is None else (current_rss_bytes() or rss_before) - rss_before,
+            'buffer_bytes': buffer_bytes,
+        })
+
+    @staticmethod
+    def _large_mesh_buffer_bytes(mesh: bpy.types.Mesh) -> int:
+        """Размер временных буферов, которые выделит запекание большого меша.
+
+        Координаты масштабируются на месте; когда раскладка памяти не
+        подтверждена, нужен буфер одной части, плюс буфер пользовательских нормалей.
+        """
+        import numpy as np
+        float3 = 3 * np.dtype(np.float32).itemsize
+        buffer_bytes = 0
+        if vector_buffer_view(mesh.vertices) is None:
+            buffer_bytes += min(len(mesh.vertices), LARGE_MESH_CHUNK) * float3
+        if mesh.has_custom_normals:
+            buffer_bytes += len(mesh.corner_normals) * float3
+        return buffer_bytes
+
+    def _bake_mesh(self, mesh: bpy.types.Mesh, scale: 'np.ndarray',
+                   scale_vectors: Callable[[object, str, 'np.ndarray'], None]):
+        import numpy as np
+        # Пользовательские нормали преобразуются обратно-транспонированной
+        # матрицей масштаба, поэтому их нужно прочитать до изменения вершин
+        custom_normals = None
+        if mesh.has_custom_normals:
+            custom_normals = np.empty(len(mesh.corner_normals) * 3, dtype=np.float32)
+            mesh.corner_normals.foreach_get("vector", custom_normals)
+            custom_normals = custom_normals.reshape(-1, 3) / scale
+            lengths = np.linalg.norm(custom_normals, axis=1, keepdims=True)
+            np.divide(custom_normals, lengths, out=custom_normals, where=lengths > 0.0)
+
+        scale_vectors(mesh.vertices, "co", scale)
+        if mesh.shape_keys is not None:
+            for key_block in mesh.shape_keys.key_blocks:
+                scale_vectors(key_block.data, "co", scale)
+
+        # Отрицательный масштаб выворачивает полигоны, как и transform_apply
+        if np.prod(np.sign(scale)) < 0:
+            mesh.flip_normals()
+
+        if custom_normals is not None:
+            mesh.normals_split_custom_set(custom_normals)
+
+        mesh.update()
+
+    # Раздельное чтение, преобразование и запись координат: преобразование не
+    # обращается к bpy и может выполняться в пуле потоков
+    def can_prepare(self, obj: bpy.types.Object) -> bool:
+        """Проверяет, что меш можно запечь через read_positions/write_positions"""
+        mesh = obj.data
+        return (self.can_bake(obj)
+                and mesh.shape_keys is None
+                and not mesh.has_custom_normals
+                and len(mesh.vertices) < self.large_mesh_threshold)
+
+    def read_positions(self, obj: bpy.types.Object) -> 'np.ndarray':
+        """Читает координаты вершин в плоский массив float32"""
+        import numpy as np
+        vertices = obj.data.vertices
+        positions = np.empty(len(vertices) * 3, dtype=np.float32)
+        vertices.foreach_get("co", positions)
+        return positions
+
+    def write_positions(self, obj: bpy.types.Object, positions: 'np.ndarray', scale: 'np.ndarray'):
+        """Записывает преобразованные координаты и сбрасывает obj.scale"""
+        import numpy as np
+        mesh = obj.data
+        mesh.vertices.foreach_set("co", positions)
+        if np.prod(np.sign(scale)) < 0:
+            mesh.flip_normals()
+        mesh.update()
+        obj.scale = (1.0, 1.0, 1.0)
+
+
+class CurveScaleBaker(ScaleBaker):
+    """Запекание масштаба кривых: точки, ручки Безье и радиусы всех сплайнов"""
+    obj_type = 'CURVE'
+
+    def can_bake(self, obj: bpy.types.Object, shared: bool = False) -> bool:
+        # Ключи формы кривых смешивают точки Безье и NURBS, их оставляем оператору
+        if not super().can_bake(obj, shared) or obj.data.shape_keys is not None:
+            return False
+        # Автоматические и векторные ручки оператор вычисляет заново, и при
+        # неравномерном масштабе они не совпадают с линейно масштабированными
+        return is_uniform_scale(obj.scale) or not has_calculated_handles(obj.data)
+
+    def bake(self, obj: bpy.types.Object, scale: 'np.ndarray'):
+        radius_factor = uniform_scale(scale)
+        for spline in obj.data.splines:
+            bezier_points = spline.bezier_points
+            if len(bezier_points):
+                for attr in ("co", "handle_left", "handle_right"):
+                    scale_attribute(bezier_points, attr, scale)
+                scale_scalar_attribute(bezier_points, "radius", radius_factor)
+            points = spline.points
+            if len(points):
+                # Точки NURBS хранятся как (x, y, z, w), вес не масштабируется
+                scale_attribute(points, "co", scale, width=4)
+                scale_scalar_attribute(points, "radius", radius_factor)
+        obj.data.update_tag()
+
+
+class SurfaceScaleBaker(CurveScaleBaker):
+    """Поверхности NURBS хранятся в тех же данных Curve, что и кривые"""
+    obj_type = 'SURFACE'
+
+
+class LatticeScaleBaker(ScaleBaker):
+    """Запекание масштаба решеток через points.co_deform"""
+    obj_type = 'LATTICE'
+
+    def can_bake(self, obj: bpy.types.Object, shared: bool = False) -> bool:
+        return super().can_bake(obj, shared) and obj.data.shape_keys is None
+
+    def bake(self, obj: bpy.types.Object, scale: 'np.ndarray'):
+        scale_attribute(obj.data.points, "co_deform", scale)
+        obj.data.update_tag()
+
+
+class MetaballScaleBaker(ScaleBaker):
+    """Запекание масштаба мета-объектов, как BKE_mball_transform.
+
+    Положения масштабируются по осям, а радиус и размеры элементов - одним
+    скалярным масштабом uniform_scale; размеры эллипсоидов - его корнем.
+    """
+    obj_type = 'META'
+
+    def can_bake(self, obj: bpy.types.Object, shared: bool = False) -> bool:
+        # Отрицательный масштаб оператор переносит и в поворот элементов
+        return super().can_bake(obj, shared) and all(s > 0.0 for s in obj.scale)
+
+    def bake(self, obj: bpy.types.Object, scale: 'np.ndarray'):
+        import numpy as np
+        elements = obj.data.elements
+        count = len(elements)
+        if not count:
+            return
+        factor = uniform_scale(scale)
+        scale_attribute(elements, "co", scale)
+        scale_scalar_attribute(elements, "radius", factor)
+        ellipsoid = np.fromiter((elements[i].type == 'ELLIPSOID' for i in range(count)), dtype=bool, count=count)
+        size_factors = np.where(ellipsoid, np.sqrt(factor), factor).astype(np.float32)
+        values = np.empty(count, dtype=np.float32)
+        for attr in ("size_x", "size_y", "size_z"):
+            elements.foreach_get(attr, values)
+            values *= size_factors
+            elements.foreach_set(attr, values)
+        obj.data.update_tag()
+
+
+class EmptyScaleBaker(ScaleBaker):
+    """Пустые объекты: масштаб переносится в размер отображения, как в transform_apply"""
+    obj_type = 'EMPTY'
+
+    def can_bake(self, obj: bpy.types.Object, shared: bool = False) -> bool:
+        return (obj.library is None
+                and obj.override_library is None
+                and object_parented_children(obj)
+                and is_unit_scale(obj.delta_scale))
+
+    def bake(self, obj: bpy.types.Object, scale: 'np.ndarray'):
+        import numpy as np
+        obj.empty_display_size *= float(np.max(np.abs(scale)))
+
+
+# Зарегистрированные бэкенды по типу объекта
+_BAKERS: Dict[str, ScaleBaker] = {}
+
+
+def register_baker(baker: ScaleBaker):
+    """Регистрирует бэкенд запекания для типа baker.obj_type"""
+    _BAKERS[baker.obj_type] = baker
+
+
+def get_type_baker(obj_type: str) -> Optional[ScaleBaker]:
+    """Возвращает зарегистрированный бэкенд типа объекта"""
+    return _BAKERS.get(obj_type)
+
+
+def get_baker(obj: bpy.types.Object) -> Optional[ScaleBaker]:
+    """Возвращает бэкенд, способный запечь масштаб объекта, или None"""
+    baker = _BAKERS.get(obj.type)
+    if baker is not None and baker.can_bake(obj):
+        return baker
+    return None
+
+
+def data_users(data) -> int:
+    """Число пользователей данных без учета фейкового пользователя"""
+    return data.users - (1 if data.use_fake_user else 0)
+
+
+def group_shared_objects(objects: List[bpy.types.Object]) -> Tuple[List[bpy.types.Object], List[List[bpy.types.Object]]]:
+    """Разделяет объекты на владельцев собственных данных и группы общих данных.
+
+    Пользователи одного datablock с одинаковым масштабом попадают в одну группу,
+    поэтому их геометрия обрабатывается один раз.
+    """
+    singles = []
+    groups: Dict[tuple, List[bpy.types.Object]] = defaultdict(list)
+    for obj in objects:
+        data = obj.data
+        if data is None or data_users(data) <= 1:
+            singles.append(obj)
+            continue
+        scale_key = tuple(round(s, SHARED_SCALE_DIGITS) for s in obj.scale)
+        groups[(data.session_uid, scale_key)].append(obj)
+    return singles, list(groups.values())
+
+
+def bake_shared_group(group: List[bpy.types.Object]) -> bool:
+    """Запекает общий масштаб группы пользователей одного datablock.
+
+    Если группа охватывает всех пользователей данных, они запекаются на месте.
+    Иначе группа получает собственную копию данных, чтобы не задеть остальных
+    пользователей. Возвращает False, если группу нужно оставить оператору.
+    """
+    import numpy as np
+    baker = _BAKERS.get(group[0].type)
+    if baker is None or not all(baker.can_bake(obj, shared=True) for obj in group):
+        return False
+
+    data = group[0].data
+    if data_users(data) != len(group):
+        data = data.copy()
+        for obj in group:
+            obj.data = data
+
+    baker.bake(group[0], np.array(group[0].scale, dtype=np.float32))
+    for obj in group:
+        obj.scale = (1.0, 1.0, 1.0)
+    return True
+
+
+def set_large_mesh_threshold(threshold: int):
+    """Задает число вершин, начиная с которого меш запекается по частям"""
+    baker = _BAKERS.get('MESH')
+    if isinstance(baker, MeshScaleBaker):
+        baker.large_mesh_threshold = threshold
+
+
+def drain_large_mesh_log() -> List[str]:
+    """Возвращает строки отчета по запеченным большим мешам и очищает журнал"""
+    lines = []
+    while large_mesh_log:
+        entry = large_mesh_log.popleft()
+        line = f"{entry['name']}: {entry['vertices']} вершин за {entry['ms']:.0f} мс"
+        line += f", буферы {entry['buffer_bytes'] / (1024 * 1024):.1f} МБ"
+        if entry['rss_delta'] is not None:
+            line += f", RSS {entry['rss_delta'] / (1024 * 1024):+.1f} МБ"
+        lines.append(line)
+    return lines
+
+
+def compensate_children(parents: List[Tuple[Sequence[bpy.types.Object], 'np.ndarray']]):
+    """Сохраняет мировые матрицы потомков после запекания масштаба родителей.
+
+    После запекания матрица родителя теряет множитель diag(S). Потомок
+    остается на месте, если его matrix_parent_inverse умножить слева на
+    diag(S), поэтому матрицы всех потомков пересчитываются одним умножением
+    и записываются по одному разу.
+    """
+    import numpy as np
+    children = []
+    factors = []
+    for parent_children, scale in parents:
+        for child in parent_children:
+            children.append(child)
+            factors.append(scale)
+    if not children:
+        return
+
+    from mathutils import Matrix
+    inverses = np.array([np.array(child.matrix_parent_inverse, dtype=np.float64) for child in children])
+    inverses[:, :3, :] *= np.asarray(factors, dtype=np.float64)[:, :, np.newaxis]
+    for child, matrix in zip(children, inverses):
+        child.matrix_parent_inverse = Matrix(matrix.tolist())
+
+
+def bake_objects(objects: List[bpy.types.Object]) -> List[bpy.types.Object]:
+    """Запекает масштаб объектов, для которых есть быстрый бэкенд.
+
+    Потомки запеченных объектов компенсируются матрицами, а не повторными
+    вызовами оператора. Возвращает объекты, которые нужно обработать через
+    transform_apply: оператор компенсирует их потомков сам.
+    """
+    import numpy as np
+    # Потомков проверяют can_bake, bake_shared_group и компенсация, поэтому без
+    # карты каждый объект оплачивает несколько обходов всех объектов файла.
+    # Одному объекту эти обходы в C дешевле прохода по файлу из Python
+    if _children_map is None and len(objects) > 1:
+        with use_children_map(build_children_map(bpy.data.objects)):
+            return bake_objects(objects)
+
+    # Масштаб родителей нужно запомнить до того, как бэкенды сбросят его
+    hierarchy = []
+    for obj in objects:
+        children = object_children(obj)
+        if children:
+            hierarchy.append((obj, children, np.array(obj.scale, dtype=np.float64)))
+
+    fallback = []
+    singles, groups = group_shared_objects(objects)
+    by_baker: Dict[ScaleBaker, List[bpy.types.Object]] = defaultdict(list)
+    for obj in singles:
+        baker = get_baker(obj)
+        if baker is None:
+            fallback.append(obj)
+        else:
+            by_baker[baker].append(obj)
+    for baker, baker_objects in by_baker.items():
+        baker.bake_many(baker_objects)
+
+    for group in groups:
+        if not bake_shared_group(group):
+            fallback.extend(group)
+
+    if hierarchy:
+        skipped = set(map(id, fallback))
+        compensate_children([(children, scale) for obj, children, scale in hierarchy
+                             if id(obj) not in skipped])
+    return fallback
+
+
+register_baker(MeshScaleBaker())
+register_baker(CurveScaleBaker())
+register_baker(SurfaceScaleBaker())
+register_baker(LatticeScaleBaker())
+register_baker(MetaballScaleBaker())
+register_baker(EmptyScaleBaker())
+# Арматуры остаются оператору: кости записываются только в режиме
+# редактирования, и переключение режима перестраивает edit-кости так же,
+# как transform_apply, плюс два лишних вызова оператора
@@ -0,0 +1,306 @@
+"""Пакетная нормализация масштаба в .blend файлах.
+
+Оркестратор распределяет файлы по пулу фоновых процессов Blender:
+
+    python batch_cli.py --blender /path/to/blender --jobs 4 --report-dir reports assets/*.blend
+
+Обработка текущего файла внутри Blender:
+
+    blender --background scene.blend --python batch_cli.py -- --report-dir reports
+
+Используются те же типы объектов (OBJECT_TYPES и свойства auto_apply_<type>
+сцены) и та же логика применения, что и в интерактивном операторе. Для каждого
+файла пишется JSON-отчет; файлы, которые по прошлому отчету уже нормализованы
+и с тех пор не менялись, пропускаются без запуска Blender.
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_MODULE = "auto_apply_scale"
+
+# Статусы отчета, при которых неизмененный файл можно пропустить
+NORMALIZED_STATUSES = ('normalized', 'already_normalized')
+
+
+def _script_args(argv):
+    """Аргументы скрипта: при запуске из Blender они идут после '--'"""
+    if '--' in argv:
+        return argv[argv.index('--') + 1:]
+    return [] if bpy is not None else argv[1:]
+
+
+def report_path(report_dir: str, filepath: str) -> str:
+    """Путь к JSON-отчету для файла"""
+    filepath = os.path.abspath(filepath)
+    digest = hashlib.sha1(filepath.encode('utf-8')).hexdigest()[:10]
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(report_dir, f"{stem}.{digest}.json")
+
+
+def _file_signature(filepath: str):
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def is_already_normalized(report_dir: str, filepath: str) -> bool:
+    """Дешевая предпроверка по прошлому отчету: файл не менялся и уже нормализован"""
+    try:
+        with open(report_path(report_dir, filepath), encoding='utf-8') as f:
+            report = json.load(f)
+        mtime_ns, size = _file_signature(filepath)
+    except (OSError, ValueError):
+        return False
+    return (report.get('status') in NORMALIZED_STATUSES
+            and report.get('mtime_ns') == mtime_ns
+            and report.get('size') == size)
+
+
+def write_report(report_dir: str, filepath: str, report: dict):
+    os.makedirs(report_dir, exist_ok=True)
+    if os.path.exists(filepath):
+        report['mtime_ns'], report['size'] = _file_signature(filepath)
+    with open(report_path(report_dir, filepath), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+# --- внутри Blender ----------------------------------------------------------
+
+def load_addon():
+    """Импортирует аддон как пакет, не регистрируя его классы"""
+    module = sys.modules.get(ADDON_MODULE)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(
+        ADDON_MODULE, os.path.join(ADDON_DIR, '__init__.py'), submodule_search_locations=[ADDON_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_MODULE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def scene_enabled_types(addon, scene, override_types=None):
+    """Типы объектов, включенные в настройках сцены.
+
+    Без зарегистрированного аддона свойства auto_apply_<type> доступны
+    только как ID-свойства сцены, поэтому читаются через scene.get.
+    """
+    if override_types:
+        return set(override_types)
+    enabled = set()
+    for obj_type, _, _ in addon.constants.OBJECT_TYPES:
+        prop_name = f"auto_apply_{obj_type.lower()}"
+        value = getattr(scene, prop_name, None)
+        if value is None:
+            value = scene.get(prop_name, obj_type == 'MESH')
+        if value:
+            enabled.add(obj_type)
+    return enabled
+
+
+def normalize_current_file(addon, override_types=None, use_fast_bake=True) -> dict:
+    """Применяет масштаб во всех сценах открытого файла"""
+    touched = 0
+    scanned = 0
+    errors = []
+    seen = set()
+    for scene in bpy.data.scenes:
+        view_layer = scene.view_layers[0]
+        enabled_types = scene_enabled_types(addon, scene, override_types)
+        candidates = [obj for obj in view_layer.objects
+                      if obj.session_uid not in seen and obj.library is None]
+        seen.update(obj.session_uid for obj in candidates)
+        scanned += len(candidates)
+        targets = addon.apply.filter_targets(candidates, enabled_types)
+        if not targets:
+            continue
+        with bpy.context.temp_override(scene=scene, view_layer=view_layer):
+            processed, scene_errors = addon.apply.apply_scale(bpy.context, targets, use_fast_bake)
+        touched += processed
+        errors.extend(scene_errors)
+    return {'objects_scanned': scanned, 'objects_touched': touched, 'errors': errors}
+
+
+def process_file(addon, filepath, report_dir, override_types=None, use_fast_bake=True,
+                 dry_run=False, output_dir=None) -> dict:
+    """Открывает файл, нормализует масштаб, сохраняет и пишет отчет"""
+    start = time.perf_counter()
+    report = {'file': os.path.abspath(filepath), 'status': 'error'}
+    try:
+        if os.path.abspath(bpy.data.filepath) != os.path.abspath(filepath):
+            bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False)
+        report['load_seconds'] = time.perf_counter() - start
+        result = normalize_current_file(addon, override_types, use_fast_bake)
+        report.update(result)
+        if result['objects_touched'] == 0 and not result['errors']:
+            report['status'] = 'already_normalized'
+        else:
+            if not dry_run:
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                    target = os.path.join(output_dir, os.path.basename(filepath))
+                    bpy.ops.wm.save_as_mainfile(filepath=target, copy=True)
+                else:
+                    bpy.ops.wm.save_mainfile()
+            if result['errors']:
+                report['status'] = 'partial'
+            else:
+                # Несохраненный файл не нормализован: следующий запуск его не пропустит
+                report['status'] = 'dry_run' if dry_run else 'normalized'
+    except Exception as e:
+        report['error'] = str(e)
+    report['seconds'] = time.perf_counter() - start
+    write_report(report_dir, filepath, report)
+    return report
+
+
+def run_worker(task_path):
+    """Обрабатывает список файлов из файла задания оркестратора"""
+    with open(task_path, encoding='utf-8') as f:
+        task = json.load(f)
+    addon = load_addon()
+    for filepath in task['files']:
+        report = process_file(addon, filepath, task['report_dir'], task.get('types'),
+                              task.get('fast_bake', True), task.get('dry_run', False),
+                              task.get('output_dir'))
+        print(f"[auto_apply_scale] {report['status']}: {filepath} "
+              f"({report.get('objects_touched', 0)} obj, {report['seconds']:.2f} s)", flush=True)
+
+
+# --- оркестратор -------------------------------------------------------------
+
+def _run_chunk(blender, files, args):
+    """Запускает один фоновый процесс Blender на порцию файлов"""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump({
+            'files': files,
+            'report_dir': os.path.abspath(args.report_dir),
+            'types': args.types,
+            'fast_bake': not args.no_fast_bake,
+            'dry_run': args.dry_run,
+            'output_dir': os.path.abspath(args.output_dir) if args.output_dir else None,
+        }, f)
+        task_path = f.name
+    try:
+        command = [blender, '--background', '--factory-startup',
+                   '--python', os.path.abspath(__file__), '--', '--worker', task_path]
+        completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, errors='replace')
+    finally:
+        os.unlink(task_path)
+
+    # Файлы без отчета означают падение процесса Blender
+    for filepath in files:
+        if not os.path.exists(report_path(args.report_dir, filepath)):
+            write_report(args.report_dir, filepath, {
+                'file': filepath,
+                'status': 'error',
+                'error': f"Blender завершился с кодом {completed.returncode}",
+                'log_tail': completed.stdout[-2000:],
+            })
+    return completed.returncode
+
+
+def run_pool(args) -> int:
+    files = [os.path.abspath(path) for path in args.files]
+    os.makedirs(args.report_dir, exist_ok=True)
+
+    pending = []
+    skipped = 0
+    for filepath in files:
+        if not args.force and is_already_normalized(args.report_dir, filepath):
+            skipped += 1
+            continue
+        # Старый отчет удаляем, чтобы отличить успешную обработку от падения
+        try:
+            os.unlink(report_path(args.report_dir, filepath))
+        except OSError:
+            pass
+        pending.append(filepath)
+
+    # Порции поменьше числа процессов выравнивают нагрузку, но каждая
+    # порция оплачивает запуск Blender, поэтому делим с запасом в 4 раза
+    jobs = max(1, args.jobs)
+    chunk_size = args.files_per_worker or max(1, -(-len(pending) // (jobs * 4)))
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(lambda chunk: _run_chunk(args.blender, chunk, args), chunks))
+
+    statuses = {}
+    touched = 0
+    for filepath in pending:
+        try:
+            with open(report_path(args.report_dir, filepath), encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            report = {'status': 'error'}
+        statuses[report['status']] = statuses.get(report['status'], 0) + 1
+        touched += report.get('objects_touched', 0)
+
+    summary = {
+        'files': len(files),
+        'skipped_by_prescan': skipped,
+        'statuses': statuses,
+        'objects_touched': touched,
+        'seconds': time.perf_counter() - start,
+    }
+    with open(os.path.join(args.report_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    print(json.dumps(summary, indent=2))
+    return 1 if statuses.get('error') or statuses.get('partial') else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетная нормализация масштаба в .blend файлах")
+    parser.add_argument('files', nargs='*', help=".blend файлы для обработки")
+    parser.add_argument('--report-dir', default='auto_apply_scale_reports', help="Каталог JSON-отчетов")
+    parser.add_argument('--blender', default=bpy.app.binary_path if bpy is not None else 'blender',
+                        help="Путь к исполняемому файлу Blender")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Число процессов Blender")
+    parser.add_argument('--files-per-worker', type=int, default=0,
+                        help="Файлов на один запуск Blender (0 - подобрать автоматически)")
+    parser.add_argument('--types', nargs='+', help="Типы объектов вместо настроек сцены, например MESH EMPTY")
+    parser.add_argument('--no-fast-bake', action='store_true', help="Применять только через transform_apply")
+    parser.add_argument('--dry-run', action='store_true', help="Не сохранять файлы")
+    parser.add_argument('--output-dir', help="Сохранять копии в каталог вместо перезаписи")
+    parser.add_argument('--force', action='store_true', help="Не пропускать уже нормализованные файлы")
+    parser.add_argument('--worker', metavar='TASK', help=argparse.SUPPRESS)
+    args = parser.parse_args(_script_args(sys.argv) if argv is None else argv)
+
+    if args.worker:
+        run_worker(args.worker)
+        return 0
+
+    if args.files:
+        return run_pool(args)
+
+    if bpy is None:
+        parser.error("не указаны файлы для обработки")
+
+    # Внутри Blender без списка файлов обрабатываем открытый файл
+    addon = load_addon()
+    report = process_file(addon, bpy.data.filepath, args.report_dir, args.types,
+                          not args.no_fast_bake, args.dry_run, args.output_dir)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0 if report['status'] in NORMALIZED_STATUSES + ('dry_run',) else 1
+
+
+if __name__ == '__main__':
+    code = main()
+    if bpy is None or bpy.app.background:
+        sys.exit(code)
@@ -0,0 +1,208 @@
+"""Сравнение быстрых бэкендов запекания с bpy.ops.object.transform_apply.
+
+Запуск внутри Blender:
+
+    blender --background --factory-startup --python benchmarks/bakers_blender.py -- --count 200 --output bakers.json
+
+Для каждого типа объектов создаются пары одинаковых объектов с одинаковым
+масштабом: первый набор обрабатывается оператором, второй - бэкендом аддона.
+Данные сравниваются с допуском, время обоих путей записывается в JSON.
+Код возврата 1 означает расхождение хотя бы для одного типа.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_bpy  # noqa: E402  (нужна только функция load_addon)
+
+SCALES = ((1.5, 0.5, 2.0), (2.0, 2.0, 2.0), (-1.0, 1.0, 1.0))
+TOLERANCE = 1e-4
+
+
+def _read(collection, attr, width):
+    values = np.empty(len(collection) * width, dtype=np.float32)
+    collection.foreach_get(attr, values)
+    return values
+
+
+def read_mesh(obj):
+    mesh = obj.data
+    return np.concatenate([_read(mesh.vertices, "co", 3), _read(mesh.polygons, "normal", 3)])
+
+
+def read_curve(obj):
+    parts = []
+    for spline in obj.data.splines:
+        if len(spline.bezier_points):
+            for attr in ("co", "handle_left", "handle_right"):
+                parts.append(_read(spline.bezier_points, attr, 3))
+            parts.append(_read(spline.bezier_points, "radius", 1))
+        if len(spline.points):
+            parts.append(_read(spline.points, "co", 4))
+            parts.append(_read(spline.points, "radius", 1))
+    return np.concatenate(parts)
+
+
+def read_lattice(obj):
+    return _read(obj.data.points, "co_deform", 3)
+
+
+def read_meta(obj):
+    elements = obj.data.elements
+    return np.concatenate([_read(elements, attr, width) for attr, width in
+                           (("co", 3), ("radius", 1), ("stiffness", 1),
+                            ("size_x", 1), ("size_y", 1), ("size_z", 1))])
+
+
+def read_armature(obj):
+    bones = obj.data.bones
+    return np.concatenate([_read(bones, "head_local", 3), _read(bones, "tail_local", 3)])
+
+
+def read_empty(obj):
+    return np.array([obj.empty_display_size], dtype=np.float32)
+
+
+def add_mesh():
+    bpy.ops.mesh.primitive_uv_sphere_add(segments=32, ring_count=16)
+
+
+def add_curve(handle_type='ALIGNED'):
+    bpy.ops.curve.primitive_bezier_curve_add()
+    for point in bpy.context.object.data.splines[0].bezier_points:
+        point.radius = 1.7
+        if handle_type != 'ALIGNED':
+            point.handle_left_type = handle_type
+            point.handle_right_type = handle_type
+
+
+def add_curve_auto():
+    add_curve('AUTO')
+
+
+def add_surface():
+    bpy.ops.surface.primitive_nurbs_surface_sphere_add()
+
+
+def add_meta():
+    bpy.ops.object.metaball_add(type='ELLIPSOID')
+
+
+def add_lattice():
+    bpy.ops.object.add(type='LATTICE')
+    bpy.context.object.data.points_u = 4
+
+
+def add_armature():
+    bpy.ops.object.armature_add()
+
+
+def add_empty():
+    bpy.ops.object.empty_add()
+
+
+CASES = {
+    'MESH': (add_mesh, read_mesh),
+    'CURVE': (add_curve, read_curve),
+    'CURVE_AUTO': (add_curve_auto, read_curve),
+    'SURFACE': (add_surface, read_curve),
+    'META': (add_meta, read_meta),
+    'LATTICE': (add_lattice, read_lattice),
+    'ARMATURE': (add_armature, read_armature),
+    'EMPTY': (add_empty, read_empty),
+}
+
+
+def make_pairs(add, count):
+    """Создает count объектов и их независимые копии"""
+    originals = []
+    for _ in range(count):
+        add()
+        originals.append(bpy.context.object)
+    copies = []
+    collection = bpy.context.scene.collection
+    for obj in originals:
+        duplicate = obj.copy()
+        if obj.data is not None:
+            duplicate.data = obj.data.copy()
+        collection.objects.link(duplicate)
+        copies.append(duplicate)
+    return originals, copies
+
+
+def select_only(objects):
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = objects[0]
+
+
+def run_case(addon, obj_type, scale, count):
+    add, read = CASES[obj_type]
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    originals, copies = make_pairs(add, count)
+    for obj in originals + copies:
+        obj.scale = scale
+
+    select_only(originals)
+    start = time.perf_counter()
+    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+    operator_seconds = time.perf_counter() - start
+
+    select_only(copies)
+    baker = addon.bakers.get_baker(copies[0])
+    # Объекты, которые бэкенд оставляет оператору, не сравниваются
+    if baker is None or not baker.can_bake(copies[0]):
+        return {'type': obj_type, 'scale': scale, 'count': count, 'baker': None}
+    start = time.perf_counter()
+    baker.bake_many(copies)
+    baker_seconds = time.perf_counter() - start
+
+    error = max(float(np.max(np.abs(read(a) - read(b)), initial=0.0)) for a, b in zip(originals, copies))
+    return {
+        'type': obj_type,
+        'scale': scale,
+        'count': count,
+        'baker': type(baker).__name__,
+        'match': error <= TOLERANCE,
+        'max_abs_error': error,
+        'operator_ms': operator_seconds * 1000.0,
+        'baker_ms': baker_seconds * 1000.0,
+        'speedup': operator_seconds / baker_seconds if baker_seconds else None,
+    }
+
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100, help="Объектов каждого типа")
+    parser.add_argument('--types', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--output', help="Путь к JSON с результатами (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    addon = fake_bpy.load_addon()
+    results = [run_case(addon, obj_type, scale, args.count)
+               for obj_type in args.types for scale in SCALES]
+    for result in results:
+        status = 'n/a' if result['baker'] is None else ('ok' if result['match'] else 'MISMATCH')
+        print(f"{result['type']:<10} scale={result['scale']} {status} "
+              f"operator={result.get('operator_ms', 0.0):.1f}ms baker={result.get('baker_ms', 0.0):.1f}ms")
+
+    text = json.dumps({'blender': bpy.app.version_string, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    sys.exit(0 if all(r['baker'] is None or r['match'] for r in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
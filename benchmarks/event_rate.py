@@ -0,0 +1,99 @@
+"""Пропускная способность modal-оператора на движении мыши без Blender.
+
+Запуск из корня репозитория:
+
+    python benchmarks/event_rate.py --events 200000 --output event_rate.json
+
+Сравниваются три варианта диспетчеризации одинакового потока событий
+MOUSEMOVE: без оператора (аддон выключен), с запущенным оператором и с
+оператором при включенной записи трассы. Для каждого варианта записывается
+число событий в секунду и объем памяти, выделенной на время обработки события (tracemalloc).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_bpy  # noqa: E402
+
+
+def dispatch(handlers, context, event, count):
+    """Передает событие count раз всем modal-обработчикам окна"""
+    for _ in range(count):
+        for handler in handlers:
+            handler.modal(context, event)
+
+
+def events_per_second(handlers, context, event, count, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        dispatch(handlers, context, event, count)
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def transient_bytes_per_event(handlers, context, event, count):
+    """Наибольший объем памяти, выделенной на время обработки одного события"""
+    dispatch(handlers, context, event, 100)
+    tracemalloc.start()
+    worst = 0
+    for _ in range(count):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        dispatch(handlers, context, event, 1)
+        worst = max(worst, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return worst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=200000, help="Событий в одном замере")
+    parser.add_argument('--repeat', type=int, default=5, help="Число замеров, берется лучший")
+    parser.add_argument('--objects', type=int, default=10000, help="Объектов в сцене")
+    parser.add_argument('--selected', type=int, default=1000, help="Выбранных объектов")
+    parser.add_argument('--output', help="Путь к JSON с результатами (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    fake_bpy.install()
+    addon = fake_bpy.load_addon()
+    addon.register()
+    context = fake_bpy.build_scene(args.objects, args.selected)
+    operator = addon.operators.AutoApplyScaleOperator()
+    operator.execute(context)
+    event = fake_bpy.Event('MOUSEMOVE')
+
+    variants = {'disabled': [], 'enabled': [operator]}
+    results = {}
+    for name, handlers in variants.items():
+        results[name] = {
+            'events_per_second': events_per_second(handlers, context, event, args.events, args.repeat),
+            'transient_bytes': transient_bytes_per_event(handlers, context, event, min(args.events, 10000)),
+        }
+
+    addon.trace.trace_recorder.start(os.devnull, context.scene)
+    results['enabled_tracing'] = {
+        'events_per_second': events_per_second([operator], context, event, args.events, args.repeat),
+        'transient_bytes': transient_bytes_per_event([operator], context, event, min(args.events, 10000)),
+    }
+    addon.trace.trace_recorder.stop()
+    operator.cancel(context)
+
+    for name, result in results.items():
+        print(f"{name:<16} {result['events_per_second']:>12.0f} events/s "
+              f"{result['transient_bytes']} bytes allocated/event", file=sys.stderr)
+
+    text = json.dumps({'objects': args.objects, 'selected': args.selected, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
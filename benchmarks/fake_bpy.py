@@ -0,0 +1,559 @@
+"""Подмена модулей bpy и mathutils для запуска логики аддона без Blender.
+
+Моделирует сцену, слой просмотра, выделение, данные мешей и стоимость
+bpy.ops.object.transform_apply: фиксированные накладные расходы на вызов
+оператора, стоимость на каждый выбранный объект и пересчет depsgraph,
+пропорциональный числу объектов в сцене.
+"""
+import contextlib
+import importlib.util
+import itertools
+import os
+import sys
+import time
+import types
+
+import numpy as np
+
+
+class Costs:
+    """Модель стоимости оператора transform_apply, в секундах"""
+    call_overhead = 0.0003
+    per_object = 0.00001
+    per_scene_object = 0.00000002
+
+
+def _spin(seconds):
+    """Активное ожидание: sleep слишком груб для долей миллисекунды"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+# --- mathutils ---------------------------------------------------------------
+
+class Vector(list):
+    def copy(self):
+        return Vector(self)
+
+    @property
+    def x(self):
+        return self[0]
+
+    @property
+    def y(self):
+        return self[1]
+
+    @property
+    def z(self):
+        return self[2]
+
+
+class Matrix(list):
+    def __init__(self, rows=None):
+        if rows is None:
+            rows = [[1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+        super().__init__(Vector(row) for row in rows)
+
+    @classmethod
+    def Identity(cls, size):
+        return cls([[1.0 if i == j else 0.0 for j in range(size)] for i in range(size)])
+
+    @classmethod
+    def Diagonal(cls, values):
+        size = len(values)
+        return cls([[values[i] if i == j else 0.0 for j in range(size)] for i in range(size)])
+
+    def to_4x4(self):
+        matrix = Matrix.Identity(4)
+        for i, row in enumerate(self):
+            for j, value in enumerate(row):
+                matrix[i][j] = value
+        return matrix
+
+    def copy(self):
+        return Matrix(self)
+
+    def __matmul__(self, other):
+        return Matrix((np.array(self) @ np.array(other)).tolist())
+
+
+# --- bpy.props ---------------------------------------------------------------
+
+class _Property:
+    """Дескриптор свойства сцены с default и update-коллбэком"""
+
+    def __init__(self, default=None, update=None, **kwargs):
+        self.default = default
+        self.update = update
+        self.kwargs = kwargs
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self._key(), self.default)
+
+    def __set__(self, instance, value):
+        instance.__dict__[self._key()] = value
+        if self.update is not None:
+            self.update(instance, bpy.context)
+
+    def _key(self):
+        return f"_prop_{id(self)}"
+
+
+def _property_factory(**kwargs):
+    return _Property(**kwargs)
+
+
+# --- bpy.types ---------------------------------------------------------------
+
+class bpy_struct:
+    def as_pointer(self):
+        return id(self)
+
+
+class ID(bpy_struct):
+    _session_uids = itertools.count(1)
+
+    def __init__(self, name):
+        self.name = name
+        self.session_uid = next(ID._session_uids)
+        self.library = None
+        self.override_library = None
+        self.users = 0
+        self.use_fake_user = False
+
+    @property
+    def original(self):
+        return self
+
+
+class _Collection(bpy_struct):
+    """Коллекция с foreach_get/foreach_set поверх массива numpy"""
+
+    def __init__(self, attributes):
+        self._attributes = attributes
+
+    def __len__(self):
+        return len(next(iter(self._attributes.values())))
+
+    def __getitem__(self, index):
+        return _Element(self, index)
+
+    def __iter__(self):
+        return (_Element(self, index) for index in range(len(self)))
+
+    def foreach_get(self, attr, buffer):
+        buffer[:] = self._attributes[attr].ravel()
+
+    def foreach_set(self, attr, buffer):
+        array = self._attributes[attr]
+        array[...] = np.asarray(buffer, dtype=array.dtype).reshape(array.shape)
+
+
+class _Element:
+    """Элемент коллекции: as_pointer() указывает на его данные в массиве"""
+
+    def __init__(self, collection, index):
+        object.__setattr__(self, '_collection', collection)
+        object.__setattr__(self, '_index', index)
+
+    def as_pointer(self):
+        array = next(iter(self._collection._attributes.values()))
+        return array.ctypes.data + self._index * array.strides[0]
+
+    def __getattr__(self, attr):
+        value = self._collection._attributes[attr][self._index]
+        return value.copy() if isinstance(value, np.ndarray) else value
+
+    def __setattr__(self, attr, value):
+        self._collection._attributes[attr][self._index] = value
+
+
+class Mesh(ID):
+    def __init__(self, name, vertex_count=8):
+        super().__init__(name)
+        co = np.random.default_rng(self.session_uid).random((vertex_count, 3), dtype=np.float32)
+        self.vertices = _Collection({'co': co})
+        self.shape_keys = None
+        self.has_custom_normals = False
+        self.flipped = False
+
+    def copy(self):
+        mesh = Mesh(f"{self.name}.001", 0)
+        mesh.vertices = _Collection({'co': self.vertices._attributes['co'].copy()})
+        return mesh
+
+    def update(self):
+        pass
+
+    def flip_normals(self):
+        self.flipped = not self.flipped
+
+
+class ObjectData(ID):
+    """Данные объектов с небольшим набором точек вместо настоящей геометрии"""
+
+    def __init__(self, name, point_count=4):
+        super().__init__(name)
+        rng = np.random.default_rng(self.session_uid)
+        self.shape_keys = None
+        self.use_fake_user = False
+        co = rng.random((point_count, 3), dtype=np.float32)
+        radius = np.ones(point_count, dtype=np.float32)
+        size = np.ones(point_count, dtype=np.float32)
+        rotation = np.tile(np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32), (point_count, 1))
+        # Атрибуты под все типы: кривые, решетки, мета-объекты
+        self.splines = [types.SimpleNamespace(
+            bezier_points=_Collection({'co': co.copy(), 'handle_left': co.copy(),
+                                       'handle_right': co.copy(), 'radius': radius.copy(),
+                                       'handle_left_type': np.full(point_count, 'ALIGNED', dtype=object),
+                                       'handle_right_type': np.full(point_count, 'ALIGNED', dtype=object)}),
+            points=_Collection({'co': np.ones((0, 4), dtype=np.float32),
+                                'radius': np.ones(0, dtype=np.float32)}),
+        )]
+        self.points = _Collection({'co_deform': co.copy()})
+        self.elements = _Collection({'co': co.copy(), 'radius': radius.copy(), 'rotation': rotation,
+                                     'size_x': size.copy(), 'size_y': size.copy(), 'size_z': size.copy(),
+                                     'stiffness': size.copy(),
+                                     'type': np.full(point_count, 'BALL', dtype=object)})
+
+    def copy(self):
+        return ObjectData(f"{self.name}.001")
+
+    def update_tag(self):
+        pass
+
+
+class Object(ID):
+    def __init__(self, name, obj_type='MESH', data=None):
+        super().__init__(name)
+        self.type = obj_type
+        self._data = None
+        self.data = data
+        self._scale = Vector((1.0, 1.0, 1.0))
+        self.delta_scale = Vector((1.0, 1.0, 1.0))
+        self.parent = None
+        self.parent_type = 'OBJECT'
+        self.children = ()
+        self.matrix_parent_inverse = Matrix()
+        self.empty_display_size = 1.0
+        self._select = False
+        self._view_layer = None
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        if self._data is not None:
+            self._data.users -= 1
+        self._data = value
+        if value is not None:
+            value.users += 1
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @scale.setter
+    def scale(self, value):
+        self._scale = Vector(value)
+
+    def select_get(self):
+        return self._select
+
+    def select_set(self, state):
+        self._select = bool(state)
+        if self._view_layer is not None:
+            selected = self._view_layer.selected
+            if state:
+                selected[self] = None
+            else:
+                selected.pop(self, None)
+
+    def __hash__(self):
+        return self.session_uid
+
+    def __eq__(self, other):
+        return self is other
+
+
+class LayerObjects(bpy_struct):
+    def __init__(self, objects, selected):
+        self._objects = objects
+        self._selected = selected
+        self.active = None
+
+    @property
+    def selected(self):
+        return _ObjectSequence(self._selected)
+
+    def __iter__(self):
+        return iter(self._objects)
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class _ObjectSequence(list):
+    """Список объектов с foreach_get, как коллекция объектов bpy"""
+
+    def foreach_get(self, attr, buffer):
+        # Внутреннее поле читается без свойства: в Blender этот цикл выполняется в C
+        field = '_' + attr
+        buffer[:] = np.fromiter(itertools.chain.from_iterable(getattr(obj, field) for obj in self),
+                                dtype=np.float32, count=len(buffer))
+
+
+class ViewLayer(bpy_struct):
+    def __init__(self, objects):
+        self.name = "ViewLayer"
+        self.selected = {}
+        self.objects = LayerObjects(objects, self.selected)
+        for obj in objects:
+            obj._view_layer = self
+
+
+class Scene(ID):
+    def __init__(self, name, objects):
+        super().__init__(name)
+        self.objects = objects
+        self.view_layers = [ViewLayer(objects)]
+
+
+class Timer(bpy_struct):
+    def __init__(self, interval):
+        self.time_step = interval
+
+
+class Operator(bpy_struct):
+    def __init__(self):
+        self.reports = []
+
+    def report(self, level, message):
+        self.reports.append((set(level), message))
+
+
+class Panel(bpy_struct):
+    pass
+
+
+class WindowManager(bpy_struct):
+    def __init__(self):
+        self.timers = []
+        self.modal_handlers = []
+        self.windows = []
+
+    def event_timer_add(self, interval, window=None):
+        timer = Timer(interval)
+        self.timers.append(timer)
+        return timer
+
+    def event_timer_remove(self, timer):
+        self.timers.remove(timer)
+
+    def modal_handler_add(self, operator):
+        self.modal_handlers.append(operator)
+        return True
+
+    def progress_begin(self, minimum, maximum):
+        pass
+
+    def progress_update(self, value):
+        pass
+
+    def progress_end(self):
+        pass
+
+
+class Collection(ID):
+    def __init__(self, name, objects=()):
+        super().__init__(name)
+        self.all_objects = list(objects)
+
+
+class Event:
+    __slots__ = ('type', 'value')
+
+    def __init__(self, event_type, value='NOTHING'):
+        self.type = event_type
+        self.value = value
+
+
+class Context:
+    def __init__(self, scene):
+        self.scene = scene
+        self.view_layer = scene.view_layers[0]
+        self.window_manager = WindowManager()
+        self.window = object()
+        self.mode = 'OBJECT'
+
+    @property
+    def selected_objects(self):
+        return list(self.view_layer.selected)
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    def temp_override(self, **kwargs):
+        return contextlib.nullcontext()
+
+
+# --- bpy.ops -----------------------------------------------------------------
+
+# Названия шагов отмены в порядке добавления
+undo_steps = []
+
+
+def _undo_push(message=''):
+    undo_steps.append(message)
+    return {'FINISHED'}
+
+
+def transform_apply(*call_args, location=False, rotation=False, scale=False, properties=True,
+                    isolate_users=False):
+    """Применяет масштаб к выделению и имитирует стоимость оператора.
+
+    Как и bpy.ops, второй позиционный аргумент включает шаг отмены оператора.
+    """
+    if len(call_args) > 1 and call_args[1]:
+        undo_steps.append("Apply Object Transform")
+    context = bpy.context
+    selected = context.selected_objects
+    _spin(Costs.call_overhead
+          + Costs.per_object * len(selected)
+          + Costs.per_scene_object * len(context.view_layer.objects))
+    if not scale:
+        return {'FINISHED'}
+    for obj in selected:
+        if obj.data is not None and obj.data.users > 1:
+            if isolate_users and isinstance(obj.data, Mesh):
+                obj.data = obj.data.copy()
+                continue
+            raise RuntimeError(f"Cannot apply to a multi user: Object \"{obj.name}\", "
+                               f"Mesh \"{obj.data.name}\", aborting")
+    for obj in selected:
+        factor = np.array(obj.scale, dtype=np.float32)
+        if isinstance(obj.data, Mesh):
+            obj.data.vertices._attributes['co'] *= factor
+            if np.prod(np.sign(factor)) < 0:
+                obj.data.flip_normals()
+        elif obj.type == 'EMPTY':
+            obj.empty_display_size *= float(np.max(np.abs(factor)))
+        obj.scale = (1.0, 1.0, 1.0)
+    return {'FINISHED'}
+
+
+# --- сборка модулей ----------------------------------------------------------
+
+bpy = types.ModuleType('bpy')
+
+
+def install():
+    """Регистрирует поддельные bpy и mathutils в sys.modules"""
+    bpy.types = types.SimpleNamespace(
+        bpy_struct=bpy_struct, ID=ID, Object=Object, Mesh=Mesh, Curve=ObjectData, Scene=Scene,
+        ViewLayer=ViewLayer, Timer=Timer, Operator=Operator, Panel=Panel,
+        WindowManager=WindowManager, Context=Context, Collection=Collection,
+    )
+    bpy.props = types.SimpleNamespace(**{
+        name: _property_factory for name in (
+            'BoolProperty', 'IntProperty', 'FloatProperty', 'StringProperty',
+            'EnumProperty', 'PointerProperty', 'CollectionProperty')
+    })
+    handlers = types.ModuleType('bpy.app.handlers')
+    handlers.persistent = lambda func: func
+    handlers.load_post = []
+    handlers.depsgraph_update_post = []
+    handlers.undo_post = []
+    handlers.redo_post = []
+    timers = types.SimpleNamespace(registered=[])
+    timers.register = lambda func, first_interval=0.0, persistent=False: timers.registered.append(func)
+    timers.is_registered = lambda func: func in timers.registered
+    timers.unregister = lambda func: timers.registered.remove(func)
+    bpy.app = types.SimpleNamespace(handlers=handlers, timers=timers, background=True,
+                                    version=(4, 3, 2))
+    bpy.ops = types.SimpleNamespace(
+        object=types.SimpleNamespace(transform_apply=transform_apply),
+        ed=types.SimpleNamespace(undo_push=_undo_push),
+    )
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None,
+                                      unregister_class=lambda cls: None)
+    bpy.data = types.SimpleNamespace(objects=[], scenes=[])
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    bpy.context = None
+
+    bpy_extras = types.ModuleType('bpy_extras')
+    bpy_extras.io_utils = types.ModuleType('bpy_extras.io_utils')
+    bpy_extras.io_utils.ExportHelper = type('ExportHelper', (), {'filepath': ''})
+    bpy_extras.io_utils.ImportHelper = type('ImportHelper', (), {'filepath': ''})
+    sys.modules['bpy_extras'] = bpy_extras
+    sys.modules['bpy_extras.io_utils'] = bpy_extras.io_utils
+
+    mathutils = types.ModuleType('mathutils')
+    mathutils.Vector = Vector
+    mathutils.Matrix = Matrix
+
+    sys.modules['bpy'] = bpy
+    sys.modules['bpy.app'] = bpy.app
+    sys.modules['bpy.app.handlers'] = handlers
+    sys.modules['bpy.types'] = bpy.types
+    sys.modules['bpy.props'] = bpy.props
+    sys.modules['mathutils'] = mathutils
+    return bpy
+
+
+def load_addon(name='auto_apply_scale'):
+    """Импортирует аддон из корня репозитория как пакет name"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(root, '__init__.py'), submodule_search_locations=[root])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def add_object(context, name, obj_type='MESH', vertex_count=8):
+    """Добавляет объект в сцену контекста"""
+    if obj_type == 'MESH':
+        data = Mesh(f"{name}.data", vertex_count)
+    elif obj_type == 'EMPTY':
+        data = None
+    else:
+        data = ObjectData(f"{name}.data")
+    obj = Object(name, obj_type, data)
+    context.scene.objects.append(obj)
+    obj._view_layer = context.view_layer
+    return obj
+
+
+def build_scene(object_count, selected_count, types_cycle=('MESH',), vertex_count=8):
+    """Создает сцену из object_count объектов и выделяет первые selected_count"""
+    objects = []
+    for i in range(object_count):
+        obj_type = types_cycle[i % len(types_cycle)]
+        if obj_type == 'MESH':
+            data = Mesh(f"Mesh.{i:06d}", vertex_count)
+        elif obj_type == 'EMPTY':
+            data = None
+        else:
+            data = ObjectData(f"{obj_type.title()}.{i:06d}")
+        objects.append(Object(f"Object.{i:06d}", obj_type, data))
+    scene = Scene("Scene", objects)
+    bpy.data.objects = objects
+    bpy.data.scenes = [scene]
+    context = Context(scene)
+    for obj in objects[:selected_count]:
+        obj.select_set(True)
+    context.view_layer.objects.active = objects[0] if objects else None
+    bpy.context = context
+    return context
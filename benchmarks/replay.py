@@ -0,0 +1,159 @@
+"""Воспроизведение трассы событий Auto Apply Scale без Blender.
+
+Запуск из корня репозитория:
+
+    python benchmarks/replay.py auto_apply_trace.jsonl --output replay.json
+
+Трассу записывает аддон (Профилирование > Записывать трассу). Объекты сцены
+воссоздаются поддельным bpy по разнице выделения, перед каждым событием
+выставляются записанные масштабы, затем событие передается оператору.
+Для каждого события набор объектов, переданных в применение, сравнивается
+с записанным, а время обработки сводится по типам событий. Код возврата 1
+означает расхождение, поэтому трассы реальных сессий можно использовать
+как регрессионные тесты.
+
+В режиме DEPSGRAPH изменения выделения и масштаба передаются хэндлеру
+depsgraph непосредственно перед событием: промежуточные обновления между
+событиями в трассе не сохраняются.
+"""
+import argparse
+import json
+import os
+import sys
+import types
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_bpy  # noqa: E402
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[int(round(fraction * (len(ordered) - 1)))]
+
+
+def latency_stats(samples):
+    return {
+        'p50_ms': percentile(samples, 0.5),
+        'p95_ms': percentile(samples, 0.95),
+        'max_ms': max(samples),
+    }
+
+
+def dispatch_depsgraph(addon, scene, ids):
+    """Передает хэндлеру аддона обновление depsgraph для ids"""
+    depsgraph = types.SimpleNamespace(scene=scene, view_layer=scene.view_layers[0], updates=[
+        types.SimpleNamespace(id=id_data, is_updated_transform=True) for id_data in ids])
+    addon.utils.auto_apply_scale_depsgraph_update(scene, depsgraph)
+
+
+def replay(addon, header, events):
+    context = fake_bpy.build_scene(0, 0)
+    scene = context.scene
+    for name, value in header['settings'].items():
+        if value is not None:
+            setattr(scene, name, value)
+    enabled_types = set(header['enabled_types'])
+    for obj_type, prop_name in addon.constants.OBJECT_TYPE_PROPS:
+        setattr(scene, prop_name, obj_type in enabled_types)
+
+    # Регистратор дает список примененных объектов и время обработки,
+    # измеренное так же, как при записи
+    recorder = addon.trace.trace_recorder
+    recorder.start(os.devnull, scene)
+    operator = addon.operators.AutoApplyScaleOperator()
+    operator.execute(context)
+    depsgraph_mode = scene.auto_apply_change_detection == 'DEPSGRAPH'
+
+    objects = {}
+    trace_keys = {}
+    replay_ms = defaultdict(list)
+    recorded_ms = defaultdict(list)
+    divergences = []
+    for index, event in enumerate(events):
+        for key, name, obj_type in event['add']:
+            obj = objects.get(key)
+            if obj is None:
+                obj = objects[key] = fake_bpy.add_object(context, name, obj_type)
+                trace_keys[obj.session_uid] = key
+            obj.select_set(True)
+        for key in event['remove']:
+            if key in objects:
+                objects[key].select_set(False)
+        if depsgraph_mode and (event['add'] or event['remove']):
+            dispatch_depsgraph(addon, scene, [scene])
+
+        transformed = []
+        for key, scale in event['scales'].items():
+            obj = objects[int(key)]
+            if tuple(obj.scale) != tuple(scale):
+                obj.scale = scale
+                transformed.append(obj)
+        if depsgraph_mode and transformed:
+            dispatch_depsgraph(addon, scene, transformed)
+
+        operator.modal(context, fake_bpy.Event(event['type'], event['value']))
+        replay_ms[event['type']].append(recorder.last_seconds * 1000.0)
+        recorded_ms[event['type']].append(event['ms'])
+        operator.reports.clear()
+
+        applied = sorted(trace_keys[key] for key in recorder.applied)
+        expected = sorted(event['applied'])
+        if applied != expected:
+            divergences.append({
+                'index': index,
+                't': event['t'],
+                'type': event['type'],
+                'value': event['value'],
+                'expected': expected,
+                'actual': applied,
+            })
+
+    operator.cancel(context)
+    recorder.stop()
+    return {
+        'events': len(events),
+        'objects': len(objects),
+        'latency': {event_type: {'count': len(samples),
+                                 'replay': latency_stats(samples),
+                                 'recorded': latency_stats(recorded_ms[event_type])}
+                    for event_type, samples in replay_ms.items()},
+        'divergences': divergences,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('trace', help="Файл трассы JSON Lines")
+    parser.add_argument('--output', help="Путь к JSON с отчетом (по умолчанию stdout)")
+    parser.add_argument('--op-overhead-ms', type=float, default=fake_bpy.Costs.call_overhead * 1000.0,
+                        help="Накладные расходы одного вызова transform_apply")
+    args = parser.parse_args(argv)
+
+    fake_bpy.Costs.call_overhead = args.op_overhead_ms / 1000.0
+    fake_bpy.install()
+    addon = fake_bpy.load_addon()
+    addon.register()
+    header, events = addon.trace.read_trace(args.trace)
+    report = replay(addon, header, events)
+    report['trace'] = os.path.abspath(args.trace)
+    report['blender'] = header['blender']
+
+    for event_type, stats in sorted(report['latency'].items()):
+        print(f"{event_type:<14} n={stats['count']:<6} "
+              f"replay p50={stats['replay']['p50_ms']:.3f}ms p95={stats['replay']['p95_ms']:.3f}ms "
+              f"recorded p50={stats['recorded']['p50_ms']:.3f}ms p95={stats['recorded']['p95_ms']:.3f}ms",
+              file=sys.stderr)
+    print(f"divergences: {len(report['divergences'])}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if report['divergences'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
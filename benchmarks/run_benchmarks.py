@@ -0,0 +1,187 @@
+"""Бенчмарки горячего пути Auto Apply Scale без Blender.
+
+Запуск из корня репозитория:
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --quick
+
+Для каждого сценария (число объектов в сцене, число выбранных объектов,
+набор включенных типов) измеряется задержка обработки событий modal-оператора
+и результаты записываются в JSON, чтобы сравнивать их между релизами.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_bpy  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+OBJECT_COUNTS = (100, 1000, 10000, 100000)
+SELECTED_COUNTS = (1, 10, 100, 1000, 10000)
+QUICK_OBJECT_COUNTS = (100, 1000, 10000)
+QUICK_SELECTED_COUNTS = (1, 100, 1000)
+
+# Состав сцены: типы объектов чередуются в этом порядке
+SCENE_TYPES = ('MESH', 'MESH', 'MESH', 'EMPTY', 'CURVE', 'ARMATURE', 'LATTICE', 'META', 'SURFACE')
+
+TYPE_FILTERS = {
+    'mesh': ('MESH',),
+    'mesh_empty': ('MESH', 'EMPTY'),
+    'all': ('MESH', 'CURVE', 'SURFACE', 'META', 'ARMATURE', 'LATTICE', 'EMPTY'),
+}
+
+
+def measure(func, repeat, setup=None):
+    """Возвращает статистику времени вызова func в миллисекундах"""
+    samples = []
+    for i in range(repeat):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'max_ms': max(samples),
+        'runs': repeat,
+    }
+
+
+def select_first(context, count):
+    """Выделяет первые count объектов сцены, снимая выделение с остальных"""
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    objects = context.scene.objects
+    for obj in objects[:count]:
+        obj.select_set(True)
+        obj.scale = (1.0, 1.0, 1.0)
+    context.view_layer.objects.active = objects[0]
+
+
+def run_scenario(addon, context, selected_count, type_filter, repeat, max_legacy_work):
+    scene = context.scene
+    select_first(context, selected_count)
+    for obj_type, _, _ in addon.constants.OBJECT_TYPES:
+        setattr(scene, f"auto_apply_{obj_type.lower()}", obj_type in type_filter)
+    scene.auto_apply_change_detection = 'TIMER'
+    scene.auto_apply_batch_mode = True
+    scene.auto_apply_fast_bake = True
+
+    addon.profiling.profiler.reset()
+    operator = addon.operators.AutoApplyScaleOperator()
+    operator.execute(context)
+    selected = context.selected_objects
+    factors = ((2.0, 2.0, 2.0), (0.5, 0.5, 0.5))
+
+    def rescale(i):
+        for obj in selected:
+            obj.scale = factors[i % 2]
+
+    def confirm():
+        operator.modal(context, fake_bpy.Event('LEFTMOUSE', 'RELEASE'))
+        operator.reports.clear()
+
+    metrics = {
+        'mouse_move': measure(lambda: operator.modal(context, fake_bpy.Event('MOUSEMOVE')), repeat),
+        'timer_tick': measure(lambda: operator.modal(context, fake_bpy.Event('TIMER')), repeat),
+        'get_objects_to_process': measure(lambda: operator._get_objects_to_process(context), repeat),
+        'confirm_batch_fast_bake': measure(confirm, repeat, rescale),
+    }
+
+    scene.auto_apply_fast_bake = False
+    metrics['confirm_batch_operator'] = measure(confirm, repeat, rescale)
+
+    # Одно подтверждение должно добавлять не больше одного шага отмены
+    rescale(0)
+    fake_bpy.undo_steps.clear()
+    confirm()
+    metrics['undo_steps_per_confirm'] = len(fake_bpy.undo_steps)
+
+    # Поштучный путь сохраняет выделение всей сцены на каждый объект,
+    # поэтому на больших сценах его измеряем только в пределах бюджета
+    if selected_count * len(scene.objects) <= max_legacy_work:
+        scene.auto_apply_batch_mode = False
+        metrics['confirm_per_object'] = measure(confirm, max(1, repeat // 2), rescale)
+
+    operator.cancel(context)
+    if addon.profiling.profiler.enabled:
+        metrics['phases'] = addon.profiling.profiler.summary()
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help="Путь к JSON с результатами (по умолчанию stdout)")
+    parser.add_argument('--quick', action='store_true', help="Сокращенная сетка сценариев")
+    parser.add_argument('--repeat', type=int, default=5, help="Число повторов каждого измерения")
+    parser.add_argument('--filters', nargs='+', choices=sorted(TYPE_FILTERS), default=sorted(TYPE_FILTERS))
+    parser.add_argument('--max-legacy-work', type=float, default=2e6,
+                        help="Предел (выбрано x объектов в сцене) для замера поштучного пути")
+    parser.add_argument('--profile', action='store_true',
+                        help="Включить встроенное профилирование и добавить статистику фаз в отчет")
+    parser.add_argument('--op-overhead-ms', type=float, default=fake_bpy.Costs.call_overhead * 1000.0,
+                        help="Накладные расходы одного вызова transform_apply")
+    args = parser.parse_args(argv)
+
+    fake_bpy.Costs.call_overhead = args.op_overhead_ms / 1000.0
+    fake_bpy.install()
+    addon = fake_bpy.load_addon()
+    addon.register()
+    addon.profiling.profiler.enabled = args.profile
+
+    object_counts = QUICK_OBJECT_COUNTS if args.quick else OBJECT_COUNTS
+    selected_counts = QUICK_SELECTED_COUNTS if args.quick else SELECTED_COUNTS
+
+    results = []
+    for object_count in object_counts:
+        context = fake_bpy.build_scene(object_count, 0, SCENE_TYPES)
+        for selected_count in selected_counts:
+            if selected_count > object_count:
+                continue
+            for filter_name in args.filters:
+                metrics = run_scenario(addon, context, selected_count, TYPE_FILTERS[filter_name],
+                                       args.repeat, args.max_legacy_work)
+                results.append({
+                    'objects': object_count,
+                    'selected': selected_count,
+                    'types': filter_name,
+                    'metrics': metrics,
+                })
+                print(f"objects={object_count:>6} selected={selected_count:>5} types={filter_name:<10} "
+                      + " ".join(f"{name}={value['median_ms']:.3f}ms" for name, value in metrics.items()
+                                 if name != 'phases' and isinstance(value, dict)),
+                      file=sys.stderr)
+
+    report = {
+        'meta': {
+            'addon_version': list(addon.bl_info['version']),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+            'costs': {
+                'call_overhead_s': fake_bpy.Costs.call_overhead,
+                'per_object_s': fake_bpy.Costs.per_object,
+                'per_scene_object_s': fake_bpy.Costs.per_scene_object,
+            },
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Время до активации трекера после загрузки .blend файлов.
+
+Запуск с интерфейсом (в фоновом режиме трекеры не запускаются):
+
+    blender --factory-startup --python benchmarks/startup_blender.py -- a.blend b.blend --output startup.json
+
+Аддон регистрируется из репозитория, затем файлы загружаются по очереди.
+Для каждого файла записывается время от load_post до активации первого
+трекера (tracker.activation_log). Авто-применение включается в сцене
+каждого загруженного файла. Прежний запуск через однократный таймер
+давал не меньше 1 с на файл.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_bpy  # noqa: E402  (нужна только функция load_addon)
+
+# Сколько ждать активации после загрузки файла, в секундах
+WAIT_TIMEOUT = 5.0
+
+
+@persistent
+def enable_auto_apply(dummy):
+    """Включает авто-применение в сцене загруженного файла до хэндлера аддона"""
+    scene = bpy.context.scene
+    scene.auto_apply_scale_enabled = True
+    scene.auto_apply_scale = True
+
+
+class StartupRun:
+    def __init__(self, addon, files, output):
+        self.addon = addon
+        self.files = list(files)
+        self.output = output
+        self.results = []
+        self.current = None
+        self.loaded_at = 0.0
+        self.seen = 0
+
+    def step(self):
+        log = self.addon.tracker.activation_log
+        if self.current is not None:
+            if len(log) > self.seen:
+                reason, seconds = log[-1]
+                self.results.append({'file': self.current, 'time_to_active_ms': seconds * 1000.0})
+            elif time.perf_counter() - self.loaded_at < WAIT_TIMEOUT:
+                return 0.01
+            else:
+                self.results.append({'file': self.current, 'time_to_active_ms': None})
+            self.current = None
+
+        if not self.files:
+            self.finish()
+            return None
+        self.current = self.files.pop(0)
+        self.seen = len(log)
+        self.loaded_at = time.perf_counter()
+        bpy.ops.wm.open_mainfile(filepath=self.current)
+        return 0.01
+
+    def finish(self):
+        for result in self.results:
+            value = result['time_to_active_ms']
+            text = f"{value:.1f}ms" if value is not None else "не активирован"
+            print(f"{os.path.basename(result['file']):<40} {text}")
+        data = json.dumps({'blender': bpy.app.version_string, 'results': self.results}, indent=2)
+        if self.output:
+            with open(self.output, 'w', encoding='utf-8') as f:
+                f.write(data)
+        else:
+            print(data)
+        bpy.ops.wm.quit_blender()
+
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='+', help="Загружаемые .blend файлы")
+    parser.add_argument('--output', help="Путь к JSON с результатами (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+    if bpy.app.background:
+        parser.error("нужен запуск с интерфейсом: в фоновом режиме трекеры не запускаются")
+
+    addon = fake_bpy.load_addon()
+    addon.register()
+    bpy.app.handlers.load_post.insert(0, enable_auto_apply)
+    run = StartupRun(addon, args.files, args.output)
+    bpy.app.timers.register(run.step, first_interval=0.5, persistent=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Память истории отмены при применении масштаба к пакету объектов.
+
+Запуск внутри Blender с интерфейсом (без --background):
+
+    blender --factory-startup --python benchmarks/undo_blender.py -- --count 1000 --output undo.json
+
+В фоновом режиме у менеджера окон нет истории отмены: ed.undo_push ничего
+не записывает, а ed.undo не проходит poll, поэтому скрипт завершается с
+ошибкой вместо бессмысленных замеров. После вывода результатов Blender
+можно закрыть.
+
+Сравниваются два режима на одинаковых сценах:
+
+* per_object - прежнее поведение: transform_apply на каждый объект со своим
+  шагом отмены;
+* single_step - применение аддона с одним шагом "Auto Apply Scale" на подтверждение.
+
+Для каждого режима записываются прирост RSS процесса (memfile-снимки
+истории отмены), время применения и время одного Ctrl+Z.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_bpy  # noqa: E402  (нужна только функция load_addon)
+
+SCALE = (1.5, 0.5, 2.0)
+
+
+def current_rss_bytes(addon):
+    """Текущий RSS процесса или 0, если он недоступен"""
+    return addon.profiling.current_rss_bytes() or 0
+
+
+def check_undo_available():
+    """Завершает скрипт, если история отмены недоступна (фоновый режим)"""
+    wm = bpy.context.window_manager
+    if bpy.app.background or wm is None or not wm.windows:
+        sys.exit("undo_blender.py: история отмены доступна только в Blender с интерфейсом, "
+                 "запустите без --background")
+    if not bpy.ops.ed.undo.poll():
+        sys.exit("undo_blender.py: ed.undo недоступен, шаг отмены не записан")
+
+
+def build_scene(count):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.context.preferences.edit.undo_steps = 256
+    objects = []
+    for _ in range(count):
+        bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=8)
+        objects.append(bpy.context.object)
+    for obj in objects:
+        obj.scale = SCALE
+    bpy.ops.ed.undo_push(message="Scale")
+    return objects
+
+
+def apply_per_object(addon, objects):
+    for obj in objects:
+        for other in bpy.context.selected_objects:
+            other.select_set(False)
+        obj.select_set(True)
+        bpy.context.view_layer.objects.active = obj
+        bpy.ops.object.transform_apply('EXEC_DEFAULT', True, location=False, rotation=False, scale=True)
+
+
+def apply_single_step(addon, objects):
+    context = bpy.context
+    context.scene.auto_apply_undo_mode = 'SEPARATE'
+    addon.apply.apply_scale(context, objects, context.scene.auto_apply_fast_bake)
+    addon.apply.push_undo_step(context)
+
+
+MODES = {
+    'per_object': apply_per_object,
+    'single_step': apply_single_step,
+}
+
+
+def run_mode(addon, mode, count):
+    objects = build_scene(count)
+    check_undo_available()
+    rss_before = current_rss_bytes(addon)
+
+    start = time.perf_counter()
+    MODES[mode](addon, objects)
+    apply_seconds = time.perf_counter() - start
+    rss_after = current_rss_bytes(addon)
+
+    start = time.perf_counter()
+    bpy.ops.ed.undo()
+    undo_seconds = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'count': count,
+        'rss_growth_mb': (rss_after - rss_before) / (1024 * 1024),
+        'apply_ms': apply_seconds * 1000.0,
+        'undo_ms': undo_seconds * 1000.0,
+    }
+
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1000, help="Объектов в пакете")
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=list(MODES))
+    parser.add_argument('--output', help="Путь к JSON с результатами (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+    check_undo_available()
+
+    addon = fake_bpy.load_addon()
+    addon.register()
+    results = [run_mode(addon, mode, args.count) for mode in args.modes]
+    for result in results:
+        print(f"{result['mode']:<12} rss +{result['rss_growth_mb']:.1f} MB "
+              f"apply={result['apply_ms']:.1f}ms undo={result['undo_ms']:.1f}ms")
+
+    text = json.dumps({'blender': bpy.app.version_string, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
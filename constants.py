@@ -1,6 +1,3 @@
-from typing import Set, Dict, List, Optional, Tuple
-from mathutils import Vector
-
 # Типы объектов
 OBJECT_TYPES = [
     ('MESH', "Mesh", "Полигональные объекты"),
@@ -12,12 +9,45 @@ OBJECT_TYPES = [
     ('EMPTY', "Empty", "Пустые объекты")
 ]
 
+# Имена свойств сцены, включающих обработку каждого типа объектов
+OBJECT_TYPE_PROPS = tuple((obj_type, f"auto_apply_{obj_type.lower()}") for obj_type, _, _ in OBJECT_TYPES)
+
 # Типы трансформаций
 TRANSFORM_TYPES = ('scale',)
 
 # События подтверждения/отмены трансформации в modal-операторе
-AUTO_APPLY_CONFIRM_EVENTS = {'LEFTMOUSE', 'RET', 'NUMPAD_ENTER'}
-AUTO_APPLY_CANCEL_EVENTS = {'RIGHTMOUSE', 'ESC'}
+AUTO_APPLY_CONFIRM_EVENTS = frozenset({'LEFTMOUSE', 'RET', 'NUMPAD_ENTER'})
+AUTO_APPLY_CANCEL_EVENTS = frozenset({'RIGHTMOUSE', 'ESC'})
+
+# Действие modal-оператора по типу события. Событие, которого нет в
+# таблице (движение мыши и т.п.), отсеивается одним поиском в словаре
+MODAL_EVENT_ACTIONS = {
+    **dict.fromkeys(AUTO_APPLY_CONFIRM_EVENTS, 'CONFIRM'),
+    **dict.fromkeys(AUTO_APPLY_CANCEL_EVENTS, 'CANCEL'),
+    'TIMER': 'TIMER',
+}
+
+# Способы отслеживания изменений масштаба
+CHANGE_DETECTION_MODES = [
+    ('DEPSGRAPH', "Depsgraph", "Снимки масштаба обновляются по событиям depsgraph_update_post"),
+    ('TIMER', "Timer", "Снимки масштаба обновляются по таймеру окна")
+]
 
-# Глобальные переменные
-auto_apply_scale_running = False 
\ No newline at end of file
+# Поведение очереди поэтапного применения при новом подтверждении
+QUEUE_CONFLICT_MODES = [
+    ('MERGE', "Merge", "Добавить новые объекты к еще не обработанным"),
+    ('CANCEL', "Cancel", "Отменить необработанный остаток и поставить в очередь только новые объекты")
+]
+
+# Как применения одного подтверждения попадают в историю отмены
+UNDO_MODES = [
+    ('SEPARATE', "Separate", "Отдельный шаг отмены: Ctrl+Z отменяет только применение масштаба"),
+    ('MERGED', "Merged", "Без отдельного шага: Ctrl+Z отменяет изменение масштаба вместе с применением")
+]
+
+# Область нормализации масштаба
+NORMALIZE_SCOPES = [
+    ('SCENE', "Scene", "Все объекты сцены"),
+    ('COLLECTION', "Collection", "Объекты выбранной коллекции и ее дочерних коллекций")
+]
+ 
\ No newline at end of file
@@ -0,0 +1,92 @@
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+from .bakers import data_users, is_unit_scale
+
+# Классы пригодности объекта к применению масштаба
+ELIGIBLE = 'ELIGIBLE'
+UNIT_SCALE = 'UNIT_SCALE'
+LINKED = 'LINKED'
+MULTI_USER = 'MULTI_USER'
+UNSUPPORTED_TYPE = 'UNSUPPORTED_TYPE'
+
+# Причины пропуска для сводки подтверждения
+SKIP_LABELS = {
+    UNIT_SCALE: "единичный масштаб",
+    LINKED: "связанные или override-данные",
+    UNSUPPORTED_TYPE: "тип не включен",
+}
+
+
+def classify_static(obj, enabled_types: FrozenSet[str]) -> str:
+    """Класс объекта без учета масштаба: тип, связанность и пользователи данных"""
+    if obj.type not in enabled_types:
+        return UNSUPPORTED_TYPE
+    data = obj.data
+    if obj.library is not None or obj.override_library is not None:
+        return LINKED
+    if data is not None:
+        if data.library is not None or data.override_library is not None:
+            return LINKED
+        if data_users(data) > 1:
+            return MULTI_USER
+    return ELIGIBLE
+
+
+class EligibilityIndex:
+    """Индекс пригодности объектов, адресуемый по session_uid.
+
+    Хранит только классы, которые не зависят от масштаба, и обновляется по
+    разнице выделений. Единичный масштаб проверяется при разбиении, потому что
+    он меняется с каждой трансформацией. Класс MULTI_USER может устареть после
+    связывания данных, но пути применения проверяют пользователей повторно.
+    """
+    __slots__ = ('classes',)
+
+    def __init__(self):
+        self.classes: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def update(self, items: Iterable[Tuple[int, object]], enabled_types: FrozenSet[str]):
+        """Классифицирует объекты заново"""
+        for key, obj in items:
+            self.classes[key] = classify_static(obj, enabled_types)
+
+    def discard(self, keys: Iterable[int]):
+        for key in keys:
+            self.classes.pop(key, None)
+
+    def partition(self, items: Iterable[Tuple[int, object]],
+                  enabled_types: FrozenSet[str]) -> Tuple[List, List, Counter]:
+        """Разбивает объекты на пригодные, с общими данными и пропущенные.
+
+        Возвращает списки пригодных объектов и объектов с общими данными
+        (их обрабатывает путь общих данных) и счетчик причин пропуска.
+        """
+        eligible = []
+        shared = []
+        skipped = Counter()
+        for key, obj in items:
+            obj_class = self.classes.get(key)
+            if obj_class is None:
+                obj_class = self.classes[key] = classify_static(obj, enabled_types)
+            if obj_class in (ELIGIBLE, MULTI_USER) and is_unit_scale(obj.scale):
+                obj_class = UNIT_SCALE
+
+            if obj_class == ELIGIBLE:
+                eligible.append(obj)
+            elif obj_class == MULTI_USER:
+                shared.append(obj)
+            else:
+                skipped[obj_class] += 1
+        return eligible, shared, skipped
+
+    def clear(self):
+        self.classes.clear()
+
+
+def format_skipped(skipped: Counter) -> str:
+    """Сводка причин пропуска одной строкой"""
+    reasons = ", ".join(f"{SKIP_LABELS[obj_class]}: {count}" for obj_class, count in skipped.most_common())
+    return f"Пропущено объектов: {sum(skipped.values())} ({reasons})"
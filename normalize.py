@@ -0,0 +1,153 @@
+import time
+import bpy
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from . import apply, bakers, eligibility
+from .snapshot import read_collection_scales
+from .state import is_object_valid
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Время главного потока на один тик нормализации, в секундах
+TICK_BUDGET = 0.05
+# Мешей в одной порции подготовки в пуле потоков
+PREPARE_BATCH = 256
+# Порций, подготавливаемых заранее, пока главный поток записывает текущую
+PREPARE_AHEAD = 2
+# Объектов в одном вызове apply_scale для остальных типов (группа общих данных не делится)
+GENERAL_BATCH = 64
+
+
+def _transform_batch(positions: List['np.ndarray'], scales: 'np.ndarray') -> List['np.ndarray']:
+    """Умножает координаты каждого меша порции на его масштаб (без обращения к bpy)"""
+    for flat, scale in zip(positions, scales):
+        flat.reshape(-1, 3)[:] *= scale
+    return positions
+
+
+class SceneNormalizer:
+    """Применение масштаба ко всем объектам набора порциями по тикам.
+
+    Масштабы читаются одним вызовом foreach_get, единичные отсеиваются
+    векторно. Простые меши идут через конвейер: главный поток читает
+    координаты порции, пул потоков умножает их на масштаб, а главный поток
+    тем временем записывает уже готовую порцию. Остальные объекты
+    обрабатываются apply.apply_scale порциями. Каждый тик укладывается в
+    TICK_BUDGET, поэтому прогресс обновляется, а нормализацию можно отменить.
+    """
+    __slots__ = ('prepared', 'general', 'in_flight', 'executor', 'use_fast_bake', 'children_map',
+                 'total', 'done', 'applied', 'skipped', 'errors', 'mesh_baker')
+
+    def __init__(self, objects, enabled_types, use_fast_bake: bool = True):
+        import numpy as np
+        self.use_fast_bake = use_fast_bake
+        self.skipped = Counter()
+        self.errors: List[str] = []
+        self.prepared: deque = deque()
+        self.general: deque = deque()
+        self.in_flight: deque = deque()
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.mesh_baker = bakers.get_type_baker('MESH')
+        self.children_map = bakers.build_children_map(bpy.data.objects)
+
+        scales = read_collection_scales(objects)
+        non_unit = np.flatnonzero(np.any(np.abs(scales - 1.0) >= bakers.UNIT_SCALE_EPSILON, axis=1))
+        # Индексация коллекции сцены по номеру линейна, поэтому список строится один раз
+        object_list = list(objects) if len(non_unit) else []
+        enabled_types = frozenset(enabled_types)
+        with bakers.use_children_map(self.children_map):
+            for index in non_unit:
+                obj = object_list[index]
+                obj_class = eligibility.classify_static(obj, enabled_types)
+                if obj_class == eligibility.ELIGIBLE and self._can_prepare(obj):
+                    self.prepared.append((obj, scales[index]))
+                elif obj_class in (eligibility.ELIGIBLE, eligibility.MULTI_USER):
+                    self.general.append(obj)
+                else:
+                    self.skipped[obj_class] += 1
+        # Пользователи общих данных обрабатываются одной порцией
+        self.general = deque(apply.group_by_shared_data(apply.sort_by_hierarchy(self.general)))
+
+        self.total = len(self.prepared) + sum(len(unit) for unit in self.general)
+        self.done = 0
+        self.applied: List[bpy.types.Object] = []
+
+    def _can_prepare(self, obj) -> bool:
+        return (self.use_fast_bake
+                and obj.type == 'MESH'
+                and isinstance(self.mesh_baker, bakers.MeshScaleBaker)
+                and self.mesh_baker.can_prepare(obj))
+
+    @property
+    def finished(self) -> bool:
+        return not (self.prepared or self.in_flight or self.general)
+
+    def tick(self, context) -> bool:
+        """Обрабатывает объекты в пределах TICK_BUDGET; возвращает True по завершении"""
+        deadline = time.perf_counter() + TICK_BUDGET
+        with bakers.use_children_map(self.children_map):
+            while time.perf_counter() < deadline:
+                if self.prepared or self.in_flight:
+                    while self.prepared and len(self.in_flight) < PREPARE_AHEAD:
+                        self._submit_batch()
+                    batch, future = self.in_flight.popleft()
+                    self._commit_batch(batch, future.result())
+                elif self.general:
+                    self._apply_general(context)
+                else:
+                    break
+        return self.finished
+
+    def _submit_batch(self):
+        """Читает координаты порции мешей и отдает их преобразование пулу потоков"""
+        import numpy as np
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(bakers.LARGE_MESH_WORKERS)
+        batch = [self.prepared.popleft() for _ in range(min(PREPARE_BATCH, len(self.prepared)))]
+        positions = [self.mesh_baker.read_positions(obj) for obj, _ in batch]
+        scales = np.array([scale for _, scale in batch], dtype=np.float32)
+        future: Future = self.executor.submit(_transform_batch, positions, scales)
+        self.in_flight.append((batch, future))
+
+    def _commit_batch(self, batch: List[Tuple[bpy.types.Object, 'np.ndarray']], positions: List['np.ndarray']):
+        """Записывает готовую порцию и компенсирует потомков запеченных мешей"""
+        import numpy as np
+        hierarchy = []
+        for (obj, scale), flat in zip(batch, positions):
+            self.done += 1
+            if not is_object_valid(obj):
+                continue
+            children = bakers.object_children(obj)
+            if children:
+                hierarchy.append((children, scale.astype(np.float64)))
+            self.mesh_baker.write_positions(obj, flat, scale)
+            self.applied.append(obj)
+        bakers.compensate_children(hierarchy)
+
+    def _apply_general(self, context):
+        chunk = []
+        while self.general and len(chunk) < GENERAL_BATCH:
+            chunk.extend(self.general.popleft())
+        self.done += len(chunk)
+        chunk = [obj for obj in chunk if is_object_valid(obj)]
+        _, errors = apply.apply_scale(context, chunk, self.use_fast_bake)
+        self.errors.extend(errors)
+        self.applied.extend(chunk)
+
+    def cancel(self) -> int:
+        """Прекращает нормализацию и возвращает число необработанных объектов"""
+        # Подготовленные порции отбрасываются: данные в Blender еще не изменены
+        remaining = (len(self.prepared) + sum(len(unit) for unit in self.general)
+                     + sum(len(batch) for batch, _ in self.in_flight))
+        self.prepared.clear()
+        self.general.clear()
+        self.in_flight.clear()
+        self.close()
+        return remaining
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -1,15 +1,25 @@
+import time
 import bpy
-from typing import Set, Dict, List, Optional, Tuple
-from mathutils import Vector
-from .constants import OBJECT_TYPES, AUTO_APPLY_CONFIRM_EVENTS, AUTO_APPLY_CANCEL_EVENTS
+from bpy_extras.io_utils import ExportHelper
+from .constants import MODAL_EVENT_ACTIONS
 from . import constants
-from .utils import get_transform_key
+from . import apply, bakers, eligibility
+from .state import ObjectStateStore, is_object_valid
+from .profiling import profiler
+from .apply_queue import apply_queue, show_status
+from .normalize import SceneNormalizer
+from .trace import trace_recorder
+from .tracker import tracker_registry
+from .utils import get_transform_key, get_enabled_types, invalidate_enabled_types
 
 # Категории объектов для операторов
 OBJECT_CATEGORIES = {
     "Объекты:": ['MESH', 'CURVE', 'SURFACE', 'META', 'EMPTY', 'ARMATURE', 'LATTICE']
 }
 
+# Общий результат modal для пропускаемых событий, чтобы не создавать set на каждое событие
+_PASS_THROUGH = {'PASS_THROUGH'}
+
 class AutoApplySelectCategoryOperator(bpy.types.Operator):
     """Выбрать все объекты в категории"""
     bl_idname = "object.auto_apply_select_category"
@@ -28,6 +38,7 @@ class AutoApplySelectCategoryOperator(bpy.types.Operator):
                 prop_name = f"auto_apply_{obj_type.lower()}"
                 if hasattr(context.scene, prop_name):
                     setattr(context.scene, prop_name, True)
+            invalidate_enabled_types(context.scene)
             self.report({'INFO'}, f"Выбраны все объекты в категории {self.category}")
         return {'FINISHED'}
 
@@ -49,113 +60,299 @@ class AutoApplyDeselectCategoryOperator(bpy.types.Operator):
                 prop_name = f"auto_apply_{obj_type.lower()}"
                 if hasattr(context.scene, prop_name):
                     setattr(context.scene, prop_name, False)
+            invalidate_enabled_types(context.scene)
             self.report({'INFO'}, f"Сняты все объекты в категории {self.category}")
         return {'FINISHED'}
 
+class AutoApplyExportProfileOperator(bpy.types.Operator, ExportHelper):
+    """Экспортировать статистику профилирования в JSON"""
+    bl_idname = "object.auto_apply_export_profile"
+    bl_label = "Export Profile"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(
+        default="*.json",
+        options={'HIDDEN'}
+    )
+
+    def execute(self, context):
+        try:
+            profiler.export(self.filepath)
+        except OSError as e:
+            self.report({'ERROR'}, f"Ошибка сохранения статистики: {str(e)}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Статистика сохранена: {self.filepath}")
+        return {'FINISHED'}
+
+class AutoApplyResetProfileOperator(bpy.types.Operator):
+    """Сбросить собранную статистику профилирования"""
+    bl_idname = "object.auto_apply_reset_profile"
+    bl_label = "Reset Profile"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        profiler.reset()
+        return {'FINISHED'}
+
+class AutoApplyCancelQueueOperator(bpy.types.Operator):
+    """Отменить поэтапное применение масштаба"""
+    bl_idname = "object.auto_apply_cancel_queue"
+    bl_label = "Cancel Queued Apply"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        remaining = apply_queue.cancel()
+        self.report({'INFO'}, f"Очередь отменена, не обработано: {remaining}")
+        return {'FINISHED'}
+
+class AutoApplyNormalizeSceneOperator(bpy.types.Operator):
+    """Применить масштаб ко всем объектам включенных типов в сцене или коллекции (Esc - отмена)"""
+    bl_idname = "object.auto_apply_normalize_scene"
+    bl_label = "Normalize All Scales"
+    bl_options = {'REGISTER'}
+
+    scope: bpy.props.EnumProperty(
+        name="Scope",
+        items=constants.NORMALIZE_SCOPES,
+        default='SCENE'
+    )
+
+    _timer: bpy.types.Timer | None = None
+    _normalizer: SceneNormalizer | None = None
+    _start: float = 0.0
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and not apply_queue.is_running
+
+    def execute(self, context):
+        scene = context.scene
+        if self.scope == 'COLLECTION':
+            collection = scene.auto_apply_normalize_collection
+            if collection is None:
+                self.report({'ERROR'}, "Коллекция для нормализации не выбрана")
+                return {'CANCELLED'}
+            objects = collection.all_objects
+        else:
+            objects = scene.objects
+
+        self._start = time.perf_counter()
+        with profiler.phase('normalize_prepare'):
+            self._normalizer = SceneNormalizer(objects, get_enabled_types(scene), scene.auto_apply_fast_bake)
+        if self._normalizer.finished:
+            return self._finish(context)
+
+        wm = context.window_manager
+        wm.progress_begin(0, self._normalizer.total)
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            remaining = self._normalizer.cancel()
+            self._cleanup(context)
+            self._report_result(context)
+            self.report({'WARNING'}, f"Нормализация отменена, не обработано: {remaining}")
+            return {'CANCELLED'}
+        # Остальные события не пропускаются, чтобы набор объектов не менялся до конца
+        if event.type != 'TIMER':
+            return {'RUNNING_MODAL'}
+
+        with profiler.phase('normalize_tick'):
+            finished = self._normalizer.tick(context)
+        context.window_manager.progress_update(self._normalizer.done)
+        show_status(f"Нормализация масштаба: {self._normalizer.done}/{self._normalizer.total} (Esc - отмена)")
+        if finished:
+            self._cleanup(context)
+            return self._finish(context)
+        return {'RUNNING_MODAL'}
+
+    def _finish(self, context):
+        self._normalizer.close()
+        self._report_result(context)
+        return {'FINISHED'}
+
+    def _cleanup(self, context):
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        show_status(None)
+
+    def _report_result(self, context):
+        normalizer = self._normalizer
+        applied = normalizer.applied
+        if applied:
+            elapsed = time.perf_counter() - self._start
+            self.report({'INFO'}, f"Масштаб нормализован: {len(applied)} объект(ов) за {elapsed:.2f} с")
+            # Режим MERGED относится к подтверждениям трансформаций; у нормализации
+            # нет предшествующего шага, с которым ее можно объединить
+            bpy.ops.ed.undo_push(message=self.bl_label)
+            # Снимки трекеров сцены должны совпадать с новым масштабом
+            for tracker in tracker_registry.for_scene(context.scene):
+                tracker.refresh_snapshots(applied)
+        elif not normalizer.skipped:
+            self.report({'INFO'}, "Объектов с неединичным масштабом не найдено")
+        if normalizer.skipped:
+            self.report({'INFO'}, eligibility.format_skipped(normalizer.skipped))
+        for error in normalizer.errors:
+            self.report({'ERROR'}, error)
+        for line in bakers.drain_large_mesh_log():
+            self.report({'INFO'}, f"Большой меш {line}")
+
 class AutoApplyScaleOperator(bpy.types.Operator):
-    """Автоматически применяет трансформации после подтверждения (только в Object Mode)"""
+    """Автоматически применяет трансформации после подтверждения (только в Object Mode)
+
+    Каждый запущенный экземпляр - трекер своего окна: состояние хранится в
+    экземпляре и привязано к сцене и слою просмотра окна (см. tracker.py).
+    """
     bl_idname = "object.auto_apply_scale"
     bl_label = "Auto Apply Scale"
     bl_options = {'REGISTER'}
 
-    _timer: Optional[bpy.types.Timer] = None
-    _prev_transforms: Dict[str, Dict[str, Vector]] = {}
-    _cached_objects: List[bpy.types.Object] = []
-    _last_selection: Set[str] = set()
-    _context_data: Dict = {}
-    _is_object_mode: bool = False
-    _last_selected_types: Set[str] = set()
+    _timer: bpy.types.Timer | None = None
+    _state: ObjectStateStore | None = None
+    _detection_mode: str = 'TIMER'
+    _scene_uid: int = 0
+    _view_layer_name: str = ""
 
     def _is_object_valid(self, obj: bpy.types.Object) -> bool:
         """Проверяет, что ссылка на объект Blender еще валидна."""
-        try:
-            obj_name = obj.name
-            return obj_name in bpy.data.objects
-        except ReferenceError:
-            return False
-
-    def _cleanup_old_data(self):
-        """Очищает данные для несуществующих объектов"""
-        existing_objects = {obj.name for obj in bpy.data.objects}
-        self._prev_transforms = {k: v for k, v in self._prev_transforms.items() if k in existing_objects}
+        return is_object_valid(obj)
 
-    def _get_objects_to_process(self, context) -> List[bpy.types.Object]:
+    def _get_objects_to_process(self, context) -> list[bpy.types.Object]:
         """Получает список объектов для обработки с кэшированием"""
-        selected_objects = [obj for obj in context.selected_objects if self._is_object_valid(obj)]
-        current_selection = {obj.name for obj in selected_objects}
-        
-        selected_types = {obj_type for obj_type, _, _ in OBJECT_TYPES 
-                          if getattr(context.scene, f"auto_apply_{obj_type.lower()}", False)}
-
-        # Всегда чистим кэш от "мертвых" ссылок StructRNA
-        self._cached_objects = [obj for obj in self._cached_objects if self._is_object_valid(obj)]
-
-        if current_selection != self._last_selection or selected_types != self._last_selected_types:
-            # Получаем список выбранных типов объектов
-            # Фильтруем объекты по выбранным типам
-            self._cached_objects = [obj for obj in selected_objects
-                                  if obj.type in selected_types]
-            
-            self._last_selection = current_selection
-            self._last_selected_types = selected_types
-            self._cleanup_old_data()
-            
-        return self._cached_objects
+        # Коллекция слоя, а не список context.selected_objects: масштаб читается одним foreach_get
+        return self._sync_selection(context.view_layer.objects.selected, context.scene)
 
-    def _has_transform_changed(self, obj: bpy.types.Object, prev: Dict[str, Vector], context) -> bool:
-        """Быстрая проверка изменений трансформаций"""
-        prev_scale = prev.get('scale')
-        if prev_scale is None:
-            return False
-        return any(abs(obj.scale[i] - prev_scale[i]) > 1e-4 for i in range(3))
+    def _sync_selection(self, selected_objects, scene) -> list[bpy.types.Object]:
+        with profiler.phase('selection_cache'):
+            self._state.sync_selection(selected_objects, get_enabled_types(scene))
+            return self._state.tracked
+
+    def is_bound_to(self, scene, view_layer=None) -> bool:
+        """Привязан ли трекер к сцене (и к слою просмотра, если он задан)"""
+        return (self._scene_uid == scene.session_uid
+                and (view_layer is None or self._view_layer_name == view_layer.name))
+
+    def rebind(self, scene, view_layer):
+        """Привязывает трекер к сцене и слою просмотра окна и заново снимает масштаб"""
+        self._scene_uid = scene.session_uid
+        self._view_layer_name = view_layer.name
+        self._state.clear()
+        self._sync_selection(view_layer.objects.selected, scene)
+        self._state.snapshot_tracked()
 
     def _save_initial_state(self, context):
         """Сохраняет начальное состояние объектов"""
-        for obj in self._get_objects_to_process(context):
-            if not self._is_object_valid(obj):
-                continue
-            obj_name = obj.name
-            if obj_name not in self._prev_transforms:
-                transforms = {'scale': obj.scale.copy()}
-                self._prev_transforms[obj_name] = transforms
+        self._get_objects_to_process(context)
+        self._state.snapshot_tracked()
+
+    def on_depsgraph_update(self, depsgraph):
+        """Обновляет снимки масштаба только для объектов из обновления depsgraph"""
+        if self._detection_mode != 'DEPSGRAPH' or bpy.context.mode != 'OBJECT':
+            return
+        with profiler.phase('depsgraph_update'):
+            self._handle_depsgraph_update(depsgraph)
+
+    def _handle_depsgraph_update(self, depsgraph):
+        selection_changed = False
+        transformed = []
+        for update in depsgraph.updates:
+            id_data = update.id
+            if isinstance(id_data, bpy.types.Object):
+                if update.is_updated_transform:
+                    transformed.append(id_data.original)
+            elif isinstance(id_data, bpy.types.Scene):
+                # Изменение выделения приходит как обновление сцены
+                selection_changed = True
+
+        if selection_changed:
+            # Выделение берется из слоя просмотра трекера, а не из активного окна
+            self._sync_selection(depsgraph.view_layer.objects.selected, depsgraph.scene)
+            self._state.snapshot_tracked()
+            return
+
+        if not transformed:
+            return
+        profiler.add_objects('depsgraph_update', len(transformed))
+        for obj in transformed:
+            # Объект, попавший в трансформацию без снимка, фиксируем по первому обновлению
+            if self._state.is_tracked(obj):
+                self._state.snapshot_object(obj)
+
+    def _sync_detection_mode(self, context):
+        """Переключает таймер при смене способа отслеживания изменений"""
+        mode = context.scene.auto_apply_change_detection
+        if mode == self._detection_mode:
+            return
+        wm = context.window_manager
+        if mode == 'TIMER':
+            interval = max(0.1, min(0.5, 0.5 / (len(context.selected_objects) or 1)))
+            self._timer = wm.event_timer_add(interval, window=context.window)
+        elif self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        self._detection_mode = mode
+        self._save_initial_state(context)
 
-    def _get_changed_objects(self, context) -> List[bpy.types.Object]:
+    def _get_changed_objects(self, context) -> list[bpy.types.Object]:
         """Возвращает список объектов, у которых изменились трансформации"""
-        changed_objects = []
-        
-        for obj in self._get_objects_to_process(context):
-            if not self._is_object_valid(obj):
-                continue
-            obj_name = obj.name
-            prev = self._prev_transforms.get(obj_name, None)
-            if prev is not None and self._has_transform_changed(obj, prev, context):
-                changed_objects.append(obj)
-                transforms = {'scale': obj.scale.copy()}
-                self._prev_transforms[obj_name] = transforms
-                    
-        return changed_objects
-
-    def _apply_transforms(self, context, obj: bpy.types.Object):
-        """Применяет трансформации к объекту"""
+        self._get_objects_to_process(context)
+        with profiler.phase('detect_changes'):
+            return self._state.changed_objects()
+
+    def memory_report(self) -> dict[str, int]:
+        """Память снимка масштаба в байтах в сравнении с раскладкой словарей"""
+        return self._state.memory_report()
+
+    def resnapshot(self):
+        """Снимает масштаб отслеживаемых объектов заново после отмены или повтора.
+
+        Иначе снимок хранит масштаб после применения, и отмененное применение
+        повторилось бы на следующем подтверждении.
+        """
+        scene = next((s for s in bpy.data.scenes if s.session_uid == self._scene_uid), None)
+        if scene is None:
+            return
+        view_layer = next((v for v in scene.view_layers if v.name == self._view_layer_name), None)
+        if view_layer is None:
+            return
+        # Отмена пересоздает объекты, поэтому ссылки берутся из слоя заново
+        self._sync_selection(view_layer.objects.selected, scene)
+        self._state.refresh(self._state.tracked)
+
+    def refresh_snapshots(self, objects: list[bpy.types.Object]):
+        """Обновляет снимки отслеживаемых объектов, масштаб которых изменен вне оператора"""
+        self._state.refresh([obj for obj in objects if is_object_valid(obj) and self._state.is_tracked(obj)])
+
+    def rollback_snapshots(self, objects: list[bpy.types.Object]):
+        """Сбрасывает снимки объектов, масштаб которых так и не был применен"""
+        self._state.reset_to_unit(objects)
+
+    def _apply_transforms(self, context, obj: bpy.types.Object) -> bool:
+        """Применяет трансформации к объекту и возвращает True, если масштаб применен"""
         obj_name = "<removed object>"
         try:
             if not self._is_object_valid(obj):
-                return
+                return False
 
             obj_name = obj.name
-            view_layer = self._context_data['view_layer']
+            view_layer = context.view_layer
             
             if not context.scene.auto_apply_scale:
-                return
+                return False
 
             # Проверяем, что тип объекта включен в настройках
-            obj_type = obj.type
-            if not getattr(context.scene, f"auto_apply_{obj_type.lower()}", False):
-                return
+            if obj.type not in get_enabled_types(context.scene):
+                return False
             
             # Проверяем, что масштаб не равен (1.0, 1.0, 1.0)
             if all(abs(s - 1.0) < 1e-6 for s in obj.scale):
-                return
+                return False
             
             # Сохраняем текущий статус выделения всех объектов
             selected_objects = {o: o.select_get() for o in context.view_layer.objects}
@@ -169,89 +366,186 @@ class AutoApplyScaleOperator(bpy.types.Operator):
             obj.select_set(True)
             view_layer.objects.active = obj
             
-            # Применяем только масштаб
-            bpy.ops.object.transform_apply(
-                location=False,
-                rotation=False,
-                scale=True
-            )
+            # Применяем только масштаб. Оператор не создает свой шаг отмены:
+            # шаг на все подтверждение добавляет _on_confirm
+            with profiler.phase('transform_apply'):
+                bpy.ops.object.transform_apply(
+                    'EXEC_DEFAULT', False,
+                    location=False,
+                    rotation=False,
+                    scale=True
+                )
+            profiler.add_objects('transform_apply', 1)
             
             # Восстанавливаем прежнее выделение
             for o, was_selected in selected_objects.items():
                 o.select_set(was_selected)
             view_layer.objects.active = active_object
+            return True
         except Exception as e:
             self.report({'ERROR'}, f"Ошибка применения масштаба: {str(e)}")
+            return False
+
+    def _apply_transforms_batch(self, context, targets: list[bpy.types.Object]) -> int:
+        """Применяет масштаб ко всем объектам за один вызов оператора.
+
+        Объекты уже отобраны индексом пригодности. Выделение сохраняется и
+        восстанавливается один раз на весь набор, поэтому стоимость зависит
+        от размера выделения, а не от числа объектов в сцене.
+        Возвращает количество обработанных объектов.
+        """
+        if not context.scene.auto_apply_scale:
+            return 0
+
+        processed, errors = apply.apply_scale(context, targets, context.scene.auto_apply_fast_bake)
+        for error in errors:
+            self.report({'ERROR'}, error)
+        return processed
+
+    def _enqueue_transforms(self, context, targets: list[bpy.types.Object]) -> int:
+        """Ставит отобранные индексом пригодности объекты в очередь поэтапного применения"""
+        scene = context.scene
+        if not scene.auto_apply_scale:
+            return 0
+
+        targets = apply.sort_by_hierarchy(targets)
+        if apply_queue.is_running and scene.auto_apply_queue_conflict == 'CANCEL':
+            remaining = apply_queue.cancel()
+            if remaining:
+                self.report({'WARNING'}, f"Предыдущая очередь отменена, не обработано: {remaining}")
+        if targets:
+            apply_queue.enqueue(context, targets, scene.auto_apply_slice_ms, scene.auto_apply_fast_bake,
+                                scene.auto_apply_undo_mode == 'SEPARATE')
+        return len(targets)
+
+    def _use_queue(self, context, objects: list[bpy.types.Object]) -> bool:
+        """Решает, применять ли масштаб поэтапно"""
+        scene = context.scene
+        if not scene.auto_apply_chunked:
+            return False
+        # Пока очередь не пуста, новые объекты идут в нее же, чтобы сохранить порядок
+        return apply_queue.is_running or len(objects) >= scene.auto_apply_chunk_threshold
 
     def _restore_selection(self, context, original_selection, original_active):
-        view_layer = self._context_data['view_layer']
         if original_active:
-            view_layer.objects.active = original_active
-
-    def _update_context_data(self, context):
-        """Обновляет кэшированные данные контекста"""
-        self._context_data = {
-            'scene': context.scene,
-            'view_layer': context.view_layer,
-            'selected_objects': context.selected_objects
-        }
-        self._is_object_mode = context.mode == 'OBJECT'
+            context.view_layer.objects.active = original_active
 
     def modal(self, context, event):
-        # Быстрая проверка на необходимость обработки события
-        if event.type not in AUTO_APPLY_CONFIRM_EVENTS.union(AUTO_APPLY_CANCEL_EVENTS).union({'TIMER'}):
-            return {'PASS_THROUGH'}
+        # Нерелевантное событие стоит одного поиска в таблице и не создает объектов
+        action = MODAL_EVENT_ACTIONS.get(event.type)
+        if action is None:
+            return _PASS_THROUGH
 
-        self._update_context_data(context)
-        
-        if not self._is_object_mode:
-            return {'PASS_THROUGH'}
+        if not trace_recorder.active:
+            return self._handle_event(context, event, action)
 
-        if not self._context_data['scene'].auto_apply_scale_enabled:
+        trace_recorder.begin_event(context.selected_objects)
+        start = time.perf_counter()
+        result = self._handle_event(context, event, action)
+        trace_recorder.end_event(event, time.perf_counter() - start)
+        return result
+
+    def _handle_event(self, context, event, action: str):
+        # Данные контекста читаются только для событий, которые их используют
+        if context.mode != 'OBJECT':
+            return _PASS_THROUGH
+
+        if not context.scene.auto_apply_scale_enabled:
             self.cancel(context)
             return {'CANCELLED'}
 
-        if event.type in AUTO_APPLY_CONFIRM_EVENTS and event.value == 'RELEASE':
-            try:
-                original_active = self._context_data['view_layer'].objects.active
-                
-                changed_objects = self._get_changed_objects(context)
-                
-                if changed_objects:
-                    for obj in changed_objects:
-                        self._apply_transforms(context, obj)
-                
-                self._restore_selection(context, [], original_active)
-            except Exception as e:
-                self.report({'ERROR'}, f"Ошибка: {str(e)}")
-            return {'PASS_THROUGH'}
-
-        elif event.type in AUTO_APPLY_CANCEL_EVENTS and event.value == 'RELEASE':
-            return {'PASS_THROUGH'}
-
-        elif event.type == 'TIMER':
-            try:
-                self._save_initial_state(context)
-            except ReferenceError as e:
-                # Объект мог быть удален между тиками таймера; чистим кэши и продолжаем.
-                self._cached_objects = [obj for obj in self._cached_objects if self._is_object_valid(obj)]
-                self._cleanup_old_data()
-        return {'PASS_THROUGH'}
+        # В окне сменили сцену или слой просмотра
+        if not self.is_bound_to(context.scene, context.view_layer):
+            self.rebind(context.scene, context.view_layer)
+
+        self._sync_detection_mode(context)
+
+        if action == 'CONFIRM':
+            if event.value == 'RELEASE':
+                with profiler.phase('event_confirm'):
+                    self._on_confirm(context)
+
+        elif action == 'TIMER':
+            with profiler.phase('event_timer'):
+                try:
+                    self._save_initial_state(context)
+                except ReferenceError as e:
+                    # Объект мог быть удален между тиками таймера; чистим кэши и продолжаем.
+                    self._state.prune_invalid()
+        return _PASS_THROUGH
+
+    def _on_confirm(self, context):
+        """Применяет масштаб к объектам, измененным с прошлого подтверждения"""
+        try:
+            original_active = context.view_layer.objects.active
+            
+            changed_objects = self._get_changed_objects(context)
+            profiler.add_objects('event_confirm', len(changed_objects))
+            
+            if changed_objects:
+                # Связанные объекты и объекты с единичным масштабом отсеиваются
+                # индексом, общие данные уходят в путь общих данных
+                eligible, shared, skipped = self._state.partition(changed_objects)
+                targets = eligible + shared
+                batch_mode = context.scene.auto_apply_batch_mode
+                if context.scene.auto_apply_scale:
+                    trace_recorder.note_applied(targets)
+
+                if targets and batch_mode and self._use_queue(context, targets):
+                    queued = self._enqueue_transforms(context, targets)
+                    if queued:
+                        self.report({'INFO'}, f"Поставлено в очередь: {queued} объект(ов)")
+                elif targets and batch_mode:
+                    start = time.perf_counter()
+                    processed = self._apply_transforms_batch(context, targets)
+                    if processed:
+                        elapsed_ms = (time.perf_counter() - start) * 1000.0
+                        self.report({'INFO'}, f"Масштаб применен: {processed} объект(ов) за {elapsed_ms:.1f} мс")
+                        apply.push_undo_step(context)
+                    for line in bakers.drain_large_mesh_log():
+                        self.report({'INFO'}, f"Большой меш {line}")
+                elif targets:
+                    applied = [self._apply_transforms(context, obj)
+                               for obj in apply.sort_by_hierarchy(eligible)]
+                    # Поштучный оператор не разделяет общие данные
+                    if self._apply_transforms_batch(context, shared) or any(applied):
+                        apply.push_undo_step(context)
+
+                if skipped and context.scene.auto_apply_scale:
+                    level = 'WARNING' if eligibility.LINKED in skipped else 'INFO'
+                    self.report({level}, eligibility.format_skipped(skipped))
+
+                # Снимок должен соответствовать масштабу после применения,
+                # иначе следующее подтверждение увидит ложное изменение
+                self._state.refresh(changed_objects)
+            
+            self._restore_selection(context, [], original_active)
+        except Exception as e:
+            self.report({'ERROR'}, f"Ошибка: {str(e)}")
 
     def execute(self, context):
         try:
-            self._update_context_data(context)
+            # Одно окно - один трекер
+            if tracker_registry.get(context.window) is not None:
+                return {'CANCELLED'}
+
             wm = context.window_manager
+            self._state = ObjectStateStore()
+            self._scene_uid = context.scene.session_uid
+            self._view_layer_name = context.view_layer.name
             
-            # Динамический интервал таймера
-            interval = max(0.1, min(0.5, 0.5 / (len(context.selected_objects) or 1)))
-            self._timer = wm.event_timer_add(interval, window=context.window)
+            # В режиме depsgraph таймер не нужен: снимки обновляет хэндлер
+            self._detection_mode = context.scene.auto_apply_change_detection
+            if self._detection_mode == 'TIMER':
+                # Динамический интервал таймера
+                interval = max(0.1, min(0.5, 0.5 / (len(context.selected_objects) or 1)))
+                self._timer = wm.event_timer_add(interval, window=context.window)
             
             # Принудительная инициализация для всех выбранных объектов
             self._save_initial_state(context)
             
             wm.modal_handler_add(self)
-            constants.auto_apply_scale_running = True
+            tracker_registry.add(context.window, self)
             return {'RUNNING_MODAL'}
         except Exception:
             return {'CANCELLED'}
@@ -261,12 +555,11 @@ class AutoApplyScaleOperator(bpy.types.Operator):
             if self._timer is not None:
                 wm = context.window_manager
                 wm.event_timer_remove(self._timer)
-            constants.auto_apply_scale_running = False
-            self._prev_transforms.clear()
-            self._cached_objects.clear()
-            self._last_selection.clear()
-            self._context_data.clear()
-            get_transform_key.cache_clear()
+                self._timer = None
+            tracker_registry.remove(self)
+            self._state.clear()
+            if not len(tracker_registry):
+                get_transform_key.cache_clear()
         except Exception:
             pass
         return {'CANCELLED'}
@@ -1,6 +1,10 @@
 import bpy
 from .constants import OBJECT_TYPES
 from .operators import OBJECT_CATEGORIES
+from .profiling import profiler
+from .apply_queue import apply_queue
+from .tracker import tracker_registry
+from .utils import get_enabled_types
 
 class AutoApplyScalePanel(bpy.types.Panel):
     """Панель управления авто-применением трансформаций"""
@@ -23,7 +27,60 @@ class AutoApplyScalePanel(bpy.types.Panel):
             box.label(text="Настройки применения масштаба:")
             row = box.row()
             row.prop(scene, "auto_apply_scale", text="Применять масштаб")
+            row = box.row()
+            row.prop(scene, "auto_apply_batch_mode", text="Пакетное применение")
+            row = box.row()
+            row.active = scene.auto_apply_batch_mode
+            row.prop(scene, "auto_apply_fast_bake", text="Быстрое запекание")
+            row = box.row()
+            row.active = scene.auto_apply_batch_mode and scene.auto_apply_fast_bake
+            row.prop(scene, "auto_apply_large_mesh_threshold", text="Порог большого меша")
+            row = box.row()
+            row.prop(scene, "auto_apply_change_detection", text="Отслеживание")
+            row = box.row()
+            row.prop(scene, "auto_apply_undo_mode", text="Отмена")
+
+            # Поэтапное применение
+            row = box.row()
+            row.active = scene.auto_apply_batch_mode
+            row.prop(scene, "auto_apply_chunked", text="Поэтапное применение")
+            if scene.auto_apply_chunked:
+                col = box.column(align=True)
+                col.active = scene.auto_apply_batch_mode
+                col.prop(scene, "auto_apply_chunk_threshold", text="Порог объектов")
+                col.prop(scene, "auto_apply_slice_ms", text="Бюджет порции, мс")
+                col.prop(scene, "auto_apply_queue_conflict", text="Новое подтверждение")
+
+            if apply_queue.is_running:
+                row = box.row()
+                row.label(text=f"Применение: {apply_queue.done}/{apply_queue.total}", icon='TIME')
+                row.operator("object.auto_apply_cancel_queue", text="", icon='CANCEL')
+
+            # Память снимка масштаба трекера этого окна
+            operator = tracker_registry.get(context.window)
+            if operator is not None:
+                try:
+                    report = operator.memory_report()
+                except ReferenceError:
+                    report = None
+                if report and report['objects']:
+                    box.label(text=(f"Снимок: {report['objects']} объект(ов), "
+                                    f"{report['array_bytes'] / 1024:.1f} КБ "
+                                    f"(словари: {report['dict_bytes'] / 1024:.1f} КБ)"),
+                              icon='INFO')
             
+            # Нормализация масштаба уже существующих объектов
+            norm_box = layout.box()
+            norm_box.label(text="Нормализация масштаба:")
+            norm_box.prop(scene, "auto_apply_normalize_collection", text="")
+            row = norm_box.row(align=True)
+            op = row.operator("object.auto_apply_normalize_scene", text="Вся сцена", icon='SCENE_DATA')
+            op.scope = 'SCENE'
+            sub = row.row(align=True)
+            sub.enabled = scene.auto_apply_normalize_collection is not None
+            op = sub.operator("object.auto_apply_normalize_scene", text="Коллекция", icon='OUTLINER_COLLECTION')
+            op.scope = 'COLLECTION'
+
             # Типы объектов в виде выпадающего меню
             obj_box = layout.box()
             
@@ -42,8 +99,7 @@ class AutoApplyScalePanel(bpy.types.Panel):
                       emboss=False)
             
             # Показываем количество выбранных типов
-            selected_count = sum(1 for obj_type, _, _ in OBJECT_TYPES 
-                               if getattr(scene, f"auto_apply_{obj_type.lower()}"))
+            selected_count = len(get_enabled_types(scene))
             header_row.label(text=f"Выбрано: {selected_count}")
             
             # Показываем список только если он раскрыт
@@ -81,4 +137,37 @@ class AutoApplyScalePanel(bpy.types.Panel):
                     for obj_type in types:
                         # Находим соответствующую метку
                         label = next((label for t, label, _ in OBJECT_TYPES if t == obj_type), obj_type)
-                        grid.prop(scene, f"auto_apply_{obj_type.lower()}", text=label) 
\ No newline at end of file
+                        grid.prop(scene, f"auto_apply_{obj_type.lower()}", text=label) 
+
+            # Статистика профилирования в сворачиваемой секции
+            prof_box = layout.box()
+            prof_header = prof_box.row()
+            prof_header.alignment = 'LEFT'
+            icon = 'TRIA_DOWN' if scene.auto_apply_show_profiling else 'TRIA_RIGHT'
+            prof_header.prop(scene, "auto_apply_show_profiling",
+                      text="Профилирование",
+                      icon=icon,
+                      emboss=False)
+
+            if scene.auto_apply_show_profiling:
+                prof_box.prop(scene, "auto_apply_profiling_enabled", text="Собирать статистику")
+
+                summary = profiler.summary()
+                if summary:
+                    col = prof_box.column(align=True)
+                    for name, stats in summary.items():
+                        col.label(text=f"{name}: {stats['count']} выз., {stats['total_ms']:.1f} мс")
+                        col.label(text=(f"    p50 {stats['p50_ms']:.2f} / p95 {stats['p95_ms']:.2f} / "
+                                        f"max {stats['max_ms']:.2f} мс, "
+                                        f"объектов/выз. {stats['objects_per_call']:.1f}"))
+                else:
+                    prof_box.label(text="Нет данных")
+
+                row = prof_box.row(align=True)
+                row.operator("object.auto_apply_export_profile", text="Экспорт JSON", icon='EXPORT')
+                row.operator("object.auto_apply_reset_profile", text="Сбросить", icon='TRASH')
+
+                prof_box.prop(scene, "auto_apply_trace_enabled", text="Записывать трассу")
+                row = prof_box.row()
+                row.enabled = not scene.auto_apply_trace_enabled
+                row.prop(scene, "auto_apply_trace_path", text="")
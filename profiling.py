@@ -0,0 +1,178 @@
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Сколько последних замеров хранить на фазу для расчета перцентилей
+SAMPLE_WINDOW = 1024
+
+
+class _NullPhase:
+    """Пустой контекстный менеджер на случай выключенного профилирования"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class PhaseStats:
+    """Статистика одной фазы: число вызовов, суммарное время, окно замеров и объекты"""
+    __slots__ = ('count', 'total', 'max', 'samples', 'objects', 'max_objects')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+        self.objects = 0
+        self.max_objects = 0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def add_objects(self, count: int):
+        self.objects += count
+        if count > self.max_objects:
+            self.max_objects = count
+
+    def percentile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[int(round(fraction * (len(ordered) - 1)))]
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000.0,
+            'p50_ms': self.percentile(0.5) * 1000.0,
+            'p95_ms': self.percentile(0.95) * 1000.0,
+            'max_ms': self.max * 1000.0,
+            'objects': self.objects,
+            'objects_per_call': self.objects / self.count if self.count else 0.0,
+            'max_objects': self.max_objects,
+        }
+
+
+class _PhaseTimer:
+    __slots__ = ('stats', 'start')
+
+    def __init__(self, stats: PhaseStats):
+        self.stats = stats
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stats.add(time.perf_counter() - self.start)
+        return False
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Текущий размер резидентной памяти процесса в байтах или None, если он недоступен.
+
+    Пиковые счетчики (ru_maxrss, PeakWorkingSetSize) растут только один раз
+    за жизнь процесса и не показывают расход отдельной операции, поэтому
+    читается именно текущее значение.
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class _MemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD),
+                        ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t),
+                        ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t),
+                        ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = _MemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        try:
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return None
+        except (AttributeError, OSError):
+            return None
+        return counters.WorkingSetSize
+
+    # Linux: второе поле statm - резидентные страницы
+    try:
+        with open('/proc/self/statm', encoding='ascii') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class Profiler:
+    """Опциональный сбор времени по фазам работы оператора.
+
+    Когда профилирование выключено, phase() возвращает общий пустой
+    контекстный менеджер и ничего не измеряет.
+    """
+    __slots__ = ('enabled', 'phases')
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: Dict[str, PhaseStats] = {}
+
+    def _stats(self, name: str) -> PhaseStats:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        return stats
+
+    def phase(self, name: str):
+        """Контекстный менеджер, измеряющий время фазы name"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _PhaseTimer(self._stats(name))
+
+    def add_objects(self, name: str, count: int):
+        """Учитывает число объектов, обработанных фазой name"""
+        if self.enabled:
+            self._stats(name).add_objects(count)
+
+    def record(self, name: str, seconds: float):
+        """Добавляет готовый замер фазы name"""
+        if self.enabled:
+            self._stats(name).add(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.as_dict() for name, stats in sorted(self.phases.items())}
+
+    def reset(self):
+        self.phases.clear()
+
+    def export(self, filepath: str):
+        """Сохраняет статистику в JSON-файл"""
+        data = {
+            'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'enabled': self.enabled,
+            'phases': self.summary(),
+        }
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+# Общий профайлер аддона
+profiler = Profiler()
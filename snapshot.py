@@ -0,0 +1,162 @@
+import sys
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Допуск, при превышении которого масштаб считается измененным
+SCALE_TOLERANCE = 1e-4
+
+
+def read_scales(objects: Sequence) -> 'np.ndarray':
+    """Читает масштаб объектов одним проходом в массив float32 формы (N, 3)"""
+    import numpy as np
+    count = len(objects)
+    flat = np.fromiter(chain.from_iterable(obj.scale for obj in objects),
+                       dtype=np.float32, count=count * 3)
+    return flat.reshape(count, 3)
+
+
+def read_collection_scales(collection) -> 'np.ndarray':
+    """Читает масштаб всех объектов коллекции bpy одним вызовом foreach_get.
+
+    Для последовательностей без foreach_get используется read_scales.
+    """
+    import numpy as np
+    foreach_get = getattr(collection, 'foreach_get', None)
+    if foreach_get is None:
+        return read_scales(collection)
+    flat = np.empty(len(collection) * 3, dtype=np.float32)
+    foreach_get('scale', flat)
+    return flat.reshape(-1, 3)
+
+
+class ScaleSnapshot:
+    """Снимок масштаба объектов в непрерывном массиве float32 (N, 3).
+
+    Строки адресуются через словарь ключ -> индекс; при удалении последняя
+    строка переносится на место удаленной, поэтому массив остается плотным.
+    Массив выделяется при первом добавлении, чтобы пустой снимок не загружал
+    numpy.
+    """
+    __slots__ = ('keys', 'index', 'scales', 'capacity')
+
+    def __init__(self, capacity: int = 64):
+        self.keys: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        self.scales: Optional['np.ndarray'] = None
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.index
+
+    def _reserve(self, count: int):
+        import numpy as np
+        if self.scales is None:
+            self.scales = np.empty((max(count, self.capacity), 3), dtype=np.float32)
+            return
+        if count <= len(self.scales):
+            return
+        capacity = max(count, len(self.scales) * 2)
+        scales = np.empty((capacity, 3), dtype=np.float32)
+        scales[:len(self.keys)] = self.scales[:len(self.keys)]
+        self.scales = scales
+
+    def add(self, keys: Sequence[Hashable], objects: Sequence, scales: Optional['np.ndarray'] = None):
+        """Добавляет снимки для ключей, которых еще нет в снимке.
+
+        scales - уже прочитанный масштаб objects (N, 3); без него масштаб
+        читается у каждого объекта.
+        """
+        new = [i for i, key in enumerate(keys) if key not in self.index]
+        if not new:
+            return
+        start = len(self.keys)
+        self._reserve(start + len(new))
+        self.scales[start:start + len(new)] = (read_scales([objects[i] for i in new]) if scales is None
+                                               else scales[new])
+        for row, i in enumerate(new, start):
+            self.index[keys[i]] = row
+            self.keys.append(keys[i])
+
+    def update(self, keys: Sequence[Hashable], objects: Sequence):
+        """Перезаписывает снимки объектов их текущим масштабом"""
+        import numpy as np
+        self.add(keys, objects)
+        rows = np.fromiter((self.index[key] for key in keys), dtype=np.intp, count=len(keys))
+        if len(rows):
+            self.scales[rows] = read_scales(objects)
+
+    def assign(self, keys: Sequence[Hashable], scale: Sequence[float]):
+        """Записывает один масштаб в снимки ключей, которые есть в снимке"""
+        rows = [self.index[key] for key in keys if key in self.index]
+        if rows:
+            self.scales[rows] = scale
+
+    def changed(self, keys: Sequence[Hashable], objects: Sequence, scales: Optional['np.ndarray'] = None,
+                tolerance: float = SCALE_TOLERANCE) -> List[int]:
+        """Возвращает позиции объектов, масштаб которых отличается от снимка.
+
+        Сравнение выполняется одной векторной проверкой; снимки измененных
+        объектов сразу обновляются до текущего масштаба. Объекты без снимка
+        не считаются измененными. scales - как в add.
+        """
+        import numpy as np
+        if not keys:
+            return []
+        rows = np.fromiter((self.index.get(key, -1) for key in keys), dtype=np.intp, count=len(keys))
+        known = np.flatnonzero(rows >= 0)
+        if not len(known):
+            return []
+        current = read_scales([objects[i] for i in known]) if scales is None else scales[known]
+        stored = self.scales[rows[known]]
+        mask = np.any(np.abs(current - stored) > tolerance, axis=1)
+        self.scales[rows[known[mask]]] = current[mask]
+        return known[mask].tolist()
+
+    def remove(self, key: Hashable):
+        """Удаляет снимок, перенося последнюю строку на его место"""
+        row = self.index.pop(key, None)
+        if row is None:
+            return
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self.index[moved] = row
+            self.scales[row] = self.scales[last]
+        self.keys.pop()
+
+    def retain(self, keys):
+        """Оставляет только снимки с ключами из keys"""
+        for key in [key for key in self.keys if key not in keys]:
+            self.remove(key)
+
+    def clear(self):
+        self.keys.clear()
+        self.index.clear()
+
+    def nbytes(self) -> int:
+        """Оценка памяти снимка: массив, индекс и список ключей"""
+        return ((0 if self.scales is None else self.scales.nbytes)
+                + sys.getsizeof(self.index)
+                + sys.getsizeof(self.keys)
+                + sum(sys.getsizeof(key) for key in self.keys))
+
+
+def dict_layout_nbytes(keys: Sequence[Hashable], vector_size: int = 0) -> int:
+    """Оценка памяти прежней раскладки {имя: {'scale': Vector}} для тех же ключей.
+
+    vector_size - размер одного Vector с буфером; если не задан, измеряется через mathutils.
+    """
+    if not vector_size:
+        from mathutils import Vector
+        # Компоненты Vector хранятся в отдельном буфере из трех float
+        vector_size = sys.getsizeof(Vector((0.0, 0.0, 0.0))) + 3 * 4
+    outer = sys.getsizeof(dict.fromkeys(keys))
+    inner = sys.getsizeof({'scale': None})
+    return outer + sum(sys.getsizeof(key) + inner + vector_size for key in keys)
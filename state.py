@@ -0,0 +1,167 @@
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Sequence, Tuple
+from .snapshot import ScaleSnapshot, dict_layout_nbytes, read_collection_scales
+from .eligibility import EligibilityIndex
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def object_key(obj) -> int:
+    """Стабильный ключ объекта на время сессии.
+
+    В отличие от obj.name, session_uid не меняется при переименовании
+    и сохраняется после отмены действия.
+    """
+    return obj.session_uid
+
+
+def is_object_valid(obj) -> bool:
+    """Проверяет, что ссылка на объект Blender еще валидна, за O(1)"""
+    try:
+        obj.session_uid
+        return True
+    except ReferenceError:
+        return False
+
+
+class ObjectStateStore:
+    """Состояние отслеживаемых объектов оператора, адресуемое по session_uid.
+
+    Хранит текущее выделение, отфильтрованный по типам список объектов, снимок
+    их масштаба и индекс пригодности. Устаревшие снимки и классы удаляются по
+    разнице выделений, без обхода всех объектов файла. Текущий масштаб
+    выделения читается одним foreach_get, когда он нужен после синхронизации.
+    """
+    __slots__ = ('selection', 'tracked', 'tracked_keys', 'tracked_rows', 'tracked_scales', 'source',
+                 'enabled_types', 'snapshot', 'eligibility')
+
+    def __init__(self):
+        self.selection: Dict[int, object] = {}
+        self.tracked: List = []
+        self.tracked_keys: List[int] = []
+        # Позиции tracked в коллекции выделения последней синхронизации
+        self.tracked_rows: List[int] = []
+        # Масштаб tracked, прочитанный после последней синхронизации, (N, 3)
+        self.tracked_scales: Optional[np.ndarray] = None
+        # Коллекция выделения последней синхронизации
+        self.source = None
+        self.enabled_types: FrozenSet[str] = frozenset()
+        self.snapshot = ScaleSnapshot()
+        self.eligibility = EligibilityIndex()
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def is_tracked(self, obj) -> bool:
+        key = object_key(obj)
+        return key in self.selection and obj.type in self.enabled_types
+
+    def sync_selection(self, selected_objects: Sequence, enabled_types) -> bool:
+        """Синхронизирует состояние с текущим выделением.
+
+        Ссылки на объекты обновляются всегда: после отмены действия Blender
+        пересоздает объекты, и старые ссылки становятся недействительными.
+        selected_objects - коллекция bpy (view_layer.objects.selected), масштаб
+        которой читается одним foreach_get, или обычная последовательность.
+        Возвращает True, если изменилось выделение или набор типов.
+        """
+        selection = {object_key(obj): obj for obj in selected_objects}
+        enabled_types = frozenset(enabled_types)
+        changed = selection.keys() != self.selection.keys() or enabled_types != self.enabled_types
+
+        if changed:
+            # Удаляем снимки только тех объектов, которые вышли из выделения
+            removed = self.selection.keys() - selection.keys()
+            for key in removed:
+                self.snapshot.remove(key)
+            self.eligibility.discard(removed)
+            # Классы зависят от набора типов: при его смене классифицируем все заново
+            if enabled_types != self.enabled_types:
+                added = selection.keys()
+            else:
+                added = selection.keys() - self.selection.keys()
+            self.eligibility.update(((key, selection[key]) for key in added), enabled_types)
+            self.enabled_types = enabled_types
+
+        self.selection = selection
+        values = list(selection.values())
+        self.tracked_rows = [row for row, obj in enumerate(values) if obj.type in enabled_types]
+        self.tracked = [values[row] for row in self.tracked_rows]
+        self.tracked_keys = [object_key(obj) for obj in self.tracked]
+        self.tracked_scales = None
+        # Повторы в коллекции сдвинули бы позиции; тогда масштаб читается по объектам
+        self.source = selected_objects if len(values) == len(selected_objects) else None
+        return changed
+
+    def snapshot_tracked(self):
+        """Сохраняет масштаб отслеживаемых объектов, у которых еще нет снимка"""
+        # Без новых объектов масштаб не читается: тик таймера не платит за выделение
+        if any(key not in self.snapshot for key in self.tracked_keys):
+            self.snapshot.add(self.tracked_keys, self.tracked, self._current_scales())
+
+    def snapshot_object(self, obj):
+        """Сохраняет масштаб объекта, если его снимка еще нет"""
+        key = object_key(obj)
+        if key not in self.snapshot:
+            self.snapshot.add([key], [obj])
+
+    def changed_objects(self) -> List:
+        """Возвращает отслеживаемые объекты с изменившимся масштабом"""
+        changed = self.snapshot.changed(self.tracked_keys, self.tracked, self._current_scales())
+        return [self.tracked[i] for i in changed]
+
+    def _current_scales(self) -> Optional['np.ndarray']:
+        """Масштаб tracked одним foreach_get по коллекции выделения или None без нее"""
+        if self.tracked_scales is None and self.source is not None:
+            self.tracked_scales = read_collection_scales(self.source)[self.tracked_rows]
+        return self.tracked_scales
+
+    def partition(self, objects: Sequence) -> Tuple[List, List, Counter]:
+        """Разбивает объекты по индексу пригодности, см. EligibilityIndex.partition"""
+        return self.eligibility.partition(((object_key(obj), obj) for obj in objects
+                                           if is_object_valid(obj)), self.enabled_types)
+
+    def refresh(self, objects: Sequence):
+        """Перезаписывает снимки объектов их текущим масштабом"""
+        objects = [obj for obj in objects if is_object_valid(obj)]
+        self.snapshot.update([object_key(obj) for obj in objects], objects)
+
+    def reset_to_unit(self, objects: Sequence):
+        """Возвращает снимки объектов к единичному масштабу.
+
+        Следующее подтверждение увидит неединичный масштаб таких объектов
+        как изменение и применит его.
+        """
+        self.snapshot.assign([object_key(obj) for obj in objects if is_object_valid(obj)], (1.0, 1.0, 1.0))
+
+    def prune_invalid(self):
+        """Удаляет из состояния объекты с недействительными ссылками"""
+        for key, obj in list(self.selection.items()):
+            if not is_object_valid(obj):
+                del self.selection[key]
+                self.snapshot.remove(key)
+                self.eligibility.discard((key,))
+        self.tracked = [obj for obj in self.tracked if is_object_valid(obj)]
+        self.tracked_keys = [object_key(obj) for obj in self.tracked]
+        self.source = None
+        self.tracked_scales = None
+
+    def memory_report(self) -> Dict[str, int]:
+        """Память снимка масштаба в байтах в сравнении с раскладкой словарей"""
+        return {
+            'objects': len(self.snapshot),
+            'array_bytes': self.snapshot.nbytes(),
+            'dict_bytes': dict_layout_nbytes(self.snapshot.keys),
+        }
+
+    def clear(self):
+        self.selection = {}
+        self.tracked = []
+        self.tracked_keys = []
+        self.tracked_rows = []
+        self.tracked_scales = None
+        self.source = None
+        self.enabled_types = frozenset()
+        self.snapshot.clear()
+        self.eligibility.clear()
@@ -0,0 +1,124 @@
+import json
+import time
+from typing import Dict, List, Optional
+import bpy
+from .constants import OBJECT_TYPE_PROPS
+from .state import object_key
+
+# Версия формата файла трассы
+TRACE_VERSION = 1
+# Настройки сцены, от которых зависит поведение оператора при воспроизведении
+TRACE_SETTINGS = (
+    'auto_apply_scale',
+    'auto_apply_batch_mode',
+    'auto_apply_fast_bake',
+    'auto_apply_change_detection',
+    'auto_apply_chunked',
+    'auto_apply_chunk_threshold',
+    'auto_apply_undo_mode',
+)
+
+
+class TraceRecorder:
+    """Запись событий modal-оператора в файл JSON Lines.
+
+    Первая строка - заголовок с настройками сцены. Далее по строке на
+    событие: тип, значение, время от начала записи, разница выделения,
+    масштабы выделенных объектов, изменившиеся с прошлой строки, объекты,
+    переданные в применение, и время обработки события.
+    """
+    __slots__ = ('file', 'start_time', 'selection', 'scales', 'pending', 'applied', 'last_seconds')
+
+    def __init__(self):
+        self.file = None
+        self.start_time = 0.0
+        self.selection: Dict[int, None] = {}
+        self.scales: Dict[int, tuple] = {}
+        self.pending: Optional[dict] = None
+        self.applied: List[int] = []
+        self.last_seconds = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.file is not None
+
+    def start(self, path: str, scene):
+        """Начинает запись в path, перезаписывая файл"""
+        self.stop()
+        self.file = open(path, 'w', encoding='utf-8', buffering=1)
+        self.start_time = time.perf_counter()
+        header = {
+            'trace': TRACE_VERSION,
+            'blender': '.'.join(map(str, bpy.app.version)),
+            'settings': {name: getattr(scene, name, None) for name in TRACE_SETTINGS},
+            'enabled_types': [obj_type for obj_type, prop_name in OBJECT_TYPE_PROPS
+                              if getattr(scene, prop_name, False)],
+        }
+        self._write(header)
+
+    def stop(self):
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.selection = {}
+        self.scales = {}
+        self.pending = None
+        self.applied = []
+
+    def begin_event(self, selected_objects):
+        """Фиксирует выделение и масштабы до обработки события"""
+        selection = {object_key(obj): obj for obj in selected_objects}
+        added = [key for key in selection if key not in self.selection]
+        removed = [key for key in self.selection if key not in selection]
+        for key in removed:
+            self.scales.pop(key, None)
+
+        scales = {}
+        for key, obj in selection.items():
+            scale = tuple(round(s, 6) for s in obj.scale)
+            if self.scales.get(key) != scale:
+                self.scales[key] = scale
+                scales[str(key)] = scale
+
+        self.selection = dict.fromkeys(selection)
+        self.applied = []
+        self.pending = {
+            't': round(time.perf_counter() - self.start_time, 6),
+            'add': [[key, selection[key].name, selection[key].type] for key in added],
+            'remove': removed,
+            'scales': scales,
+        }
+
+    def note_applied(self, objects):
+        """Отмечает объекты, переданные в применение текущим событием"""
+        if self.file is not None:
+            self.applied.extend(object_key(obj) for obj in objects)
+
+    def end_event(self, event, seconds: float):
+        """Записывает строку события после его обработки"""
+        line = self.pending
+        if line is None or self.file is None:
+            return
+        self.last_seconds = seconds
+        line['type'] = event.type
+        line['value'] = event.value
+        line['applied'] = self.applied
+        line['ms'] = round(seconds * 1000.0, 4)
+        self._write(line)
+        self.pending = None
+
+    def _write(self, line: dict):
+        self.file.write(json.dumps(line, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def read_trace(path: str):
+    """Читает файл трассы и возвращает заголовок и список событий"""
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get('trace') != TRACE_VERSION:
+        raise ValueError(f"{path}: не файл трассы версии {TRACE_VERSION}")
+    return lines[0], lines[1:]
+
+
+# Общий регистратор аддона
+trace_recorder = TraceRecorder()
@@ -0,0 +1,215 @@
+import time
+from collections import deque
+from typing import Deque, Dict, FrozenSet, List, Optional, Tuple
+import bpy
+from .profiling import profiler
+
+# Интервал повторной проверки готовности окон после запуска или загрузки файла, в секундах
+READY_RETRY_INTERVAL = 0.05
+# Сколько ждать появления окон, прежде чем отказаться от запуска, в секундах
+READY_TIMEOUT = 10.0
+# Последние замеры времени до активации трекера: (причина запуска, секунды)
+activation_log: Deque[Tuple[str, float]] = deque(maxlen=64)
+
+
+def is_scene_enabled(scene) -> bool:
+    """Включено ли авто-применение масштаба в настройках сцены"""
+    return (scene is not None
+            and getattr(scene, 'auto_apply_scale_enabled', False)
+            and getattr(scene, 'auto_apply_scale', False))
+
+
+def window_key(window) -> int:
+    """Ключ окна в реестре трекеров"""
+    try:
+        return window.as_pointer()
+    except (AttributeError, ReferenceError):
+        return id(window)
+
+
+class TrackerRegistry:
+    """Запущенные трекеры авто-применения масштаба по окнам.
+
+    Трекер - экземпляр modal-оператора AutoApplyScaleOperator со своим
+    состоянием, привязанный к сцене и слою просмотра своего окна. Поэтому
+    несколько главных окон и сцен отслеживаются независимо, а стоимость
+    каждого трекера зависит только от его выделения. Реестр запускает
+    недостающие трекеры и перепривязывает их при смене сцены в окне.
+    """
+    __slots__ = ('trackers', 'known_windows', 'pending_since', 'pending_reason')
+
+    def __init__(self):
+        self.trackers: Dict[int, object] = {}
+        # Ключи окон, обработанных последней синхронизацией
+        self.known_windows: FrozenSet[int] = frozenset()
+        # Время запроса запуска, для которого еще не активирован ни один трекер
+        self.pending_since: Optional[float] = None
+        self.pending_reason = ""
+
+    def __len__(self) -> int:
+        return len(self.trackers)
+
+    def add(self, window, tracker):
+        self.trackers[window_key(window)] = tracker
+        if self.pending_since is not None:
+            self._record_activation(time.perf_counter() - self.pending_since)
+
+    def _record_activation(self, seconds: float):
+        """Фиксирует время от запроса запуска до активации первого трекера"""
+        activation_log.append((self.pending_reason, seconds))
+        profiler.record('time_to_active', seconds)
+        if profiler.enabled:
+            print(f"Auto Apply Scale: трекер активен через {seconds * 1000.0:.1f} мс ({self.pending_reason})")
+        self.pending_since = None
+
+    def remove(self, tracker):
+        """Убирает трекер из реестра; окна других трекеров не затрагиваются"""
+        for key, other in list(self.trackers.items()):
+            if other is tracker:
+                del self.trackers[key]
+
+    def get(self, window):
+        """Трекер окна или None"""
+        tracker = self.trackers.get(window_key(window))
+        if tracker is None:
+            return None
+        if not self._is_alive(tracker):
+            self.remove(tracker)
+            return None
+        return tracker
+
+    def live(self) -> List[object]:
+        """Все трекеры, операторы которых еще не завершены"""
+        found = []
+        for tracker in list(self.trackers.values()):
+            if self._is_alive(tracker):
+                found.append(tracker)
+            else:
+                self.remove(tracker)
+        return found
+
+    def for_scene(self, scene, view_layer=None) -> List[object]:
+        """Трекеры, привязанные к сцене (и к слою просмотра, если он задан)"""
+        found = []
+        for tracker in list(self.trackers.values()):
+            try:
+                if tracker.is_bound_to(scene, view_layer):
+                    found.append(tracker)
+            except ReferenceError:
+                # Оператор уже завершен, а ссылка на него осталась
+                self.remove(tracker)
+        return found
+
+    def clear(self):
+        self.trackers.clear()
+        self.known_windows = frozenset()
+        self.pending_since = None
+
+    def windows_changed(self) -> bool:
+        """Изменился ли набор окон с последней синхронизации.
+
+        Modal-оператор получает события только своего окна, поэтому новому
+        окну со сценой, которую уже отслеживает другое окно, нужен свой трекер.
+        """
+        wm = getattr(bpy.context, 'window_manager', None)
+        if wm is None:
+            return False
+        return frozenset(window_key(window) for window in wm.windows) != self.known_windows
+
+    def sync(self):
+        """Приводит трекеры в соответствие с окнами и их сценами.
+
+        Трекеры закрытых окон удаляются, трекер окна со сменившейся сценой
+        перепривязывается, в окнах с включенным авто-применением без трекера
+        запускается новый оператор. В фоновом режиме окон и событий нет,
+        поэтому отслеживание не запускается.
+        """
+        if bpy.app.background:
+            return
+        windows = list(bpy.context.window_manager.windows)
+        live = {window_key(window) for window in windows}
+        for key in [key for key in self.trackers if key not in live]:
+            del self.trackers[key]
+
+        for window in windows:
+            scene = window.scene
+            tracker = self.get(window)
+            if tracker is not None:
+                if not tracker.is_bound_to(scene, window.view_layer):
+                    tracker.rebind(scene, window.view_layer)
+                continue
+            if not is_scene_enabled(scene):
+                continue
+            with bpy.context.temp_override(window=window):
+                # Вне Object Mode трекер запустит хэндлер depsgraph после смены режима
+                if bpy.context.mode != 'OBJECT':
+                    continue
+                try:
+                    bpy.ops.object.auto_apply_scale('INVOKE_DEFAULT')
+                except RuntimeError as e:
+                    print(f"Auto Apply Scale: не удалось запустить трекер: {e}")
+
+        # Окна, где трекер не запустился (не Object Mode, ошибка), остаются
+        # неизвестными, и следующее обновление depsgraph повторит попытку
+        self.known_windows = frozenset(window_key(window) for window in windows
+                                       if window_key(window) in self.trackers
+                                       or not is_scene_enabled(window.scene))
+
+    def schedule_sync(self):
+        """Откладывает sync до ближайшего тика таймеров: из хэндлеров нельзя вызывать операторы"""
+        if bpy.app.background:
+            return
+        if not bpy.app.timers.is_registered(_sync_timer):
+            bpy.app.timers.register(_sync_timer, first_interval=0.0)
+
+    def start_when_ready(self, reason: str):
+        """Запускает трекеры, как только появятся окна, вместо фиксированной задержки.
+
+        Готовность проверяется таймером с нулевой первой задержкой и
+        короткими повторами, пока у менеджера окон нет окон. Время до
+        активации первого трекера записывается в activation_log и в
+        профайлер (фаза time_to_active).
+        """
+        if bpy.app.background:
+            return
+        self.pending_since = time.perf_counter()
+        self.pending_reason = reason
+        if not bpy.app.timers.is_registered(_ready_timer):
+            bpy.app.timers.register(_ready_timer, first_interval=0.0)
+
+    def _ready_step(self) -> Optional[float]:
+        """Шаг проверки готовности; возвращает интервал следующей проверки или None"""
+        if self.pending_since is None:
+            return None
+        wm = getattr(bpy.context, 'window_manager', None)
+        if wm is None or not wm.windows:
+            if time.perf_counter() - self.pending_since > READY_TIMEOUT:
+                print(f"Auto Apply Scale: окна не появились за {READY_TIMEOUT:.0f} с ({self.pending_reason})")
+                self.pending_since = None
+                return None
+            return READY_RETRY_INTERVAL
+        self.sync()
+        # Без включенных сцен ждать активации нечего
+        if self.pending_since is not None and not any(is_scene_enabled(w.scene) for w in wm.windows):
+            self.pending_since = None
+        return None
+
+    @staticmethod
+    def _is_alive(tracker) -> bool:
+        try:
+            return tracker.bl_idname is not None
+        except ReferenceError:
+            return False
+
+
+# Глобальный реестр трекеров
+tracker_registry = TrackerRegistry()
+
+
+def _sync_timer() -> Optional[float]:
+    tracker_registry.sync()
+    return None  # однократный таймер
+
+
+def _ready_timer() -> Optional[float]:
+    return tracker_registry._ready_step()
@@ -1,7 +1,11 @@
 from functools import lru_cache
+from typing import Dict, FrozenSet
 import bpy
 from bpy.app.handlers import persistent
 from . import constants
+from .profiling import profiler
+from .trace import trace_recorder
+from .tracker import tracker_registry, is_scene_enabled
 
 @lru_cache(maxsize=128)
 def get_transform_key(obj_name: str, transform_type: str) -> str:
@@ -10,18 +14,102 @@ def get_transform_key(obj_name: str, transform_type: str) -> str:
 
 def reset_auto_apply_scale_status():
     """Сбрасывает статус работы Auto Apply Scale"""
-    constants.auto_apply_scale_running = False
+    tracker_registry.clear()
     get_transform_key.cache_clear()
 
+# Включенные типы объектов по сцене (session_uid -> frozenset)
+_enabled_types_cache: Dict[int, FrozenSet[str]] = {}
+
+def get_enabled_types(scene) -> FrozenSet[str]:
+    """Возвращает включенные типы объектов сцены из кэша.
+
+    Кэш обновляется update-коллбэками свойств auto_apply_<type>, операторами
+    выбора категорий и хэндлерами загрузки файла и отмены действия.
+    """
+    key = scene.session_uid
+    enabled = _enabled_types_cache.get(key)
+    if enabled is None:
+        enabled = frozenset(obj_type for obj_type, prop_name in constants.OBJECT_TYPE_PROPS
+                            if getattr(scene, prop_name, False))
+        _enabled_types_cache[key] = enabled
+    return enabled
+
+def invalidate_enabled_types(scene=None):
+    """Сбрасывает кэш включенных типов для сцены или для всех сцен"""
+    if scene is None:
+        _enabled_types_cache.clear()
+    else:
+        _enabled_types_cache.pop(scene.session_uid, None)
+
+def update_enabled_types(self, context):
+    """update-коллбэк свойств auto_apply_<type>"""
+    invalidate_enabled_types(self)
+
+@persistent
+def auto_apply_scale_undo_post(dummy):
+    """Отмена действия возвращает значения свойств без вызова update-коллбэков.
+
+    Масштаб объектов тоже возвращается без событий, поэтому снимки трекеров
+    переснимаются: отмененное применение не должно сработать снова.
+    """
+    invalidate_enabled_types()
+    for tracker in tracker_registry.live():
+        try:
+            tracker.resnapshot()
+        except ReferenceError:
+            tracker_registry.remove(tracker)
+
 def update_auto_apply_scale(self, context):
-    """Обновляет состояние авто-применения трансформаций"""
-    if context.mode == 'OBJECT':
-        if self.auto_apply_scale_enabled and self.auto_apply_scale:
-            if not constants.auto_apply_scale_running:
-                try:
-                    bpy.ops.object.auto_apply_scale('INVOKE_DEFAULT')
-                except Exception:
-                    pass
+    """Обновляет состояние авто-применения трансформаций.
+
+    Трекеры запускаются во всех окнах, показывающих включенную сцену;
+    выключенная сцена останавливает свои трекеры на их следующем событии.
+    """
+    if is_scene_enabled(self):
+        tracker_registry.sync()
+
+def update_profiling_enabled(self, context):
+    """Включает или выключает сбор статистики профилирования"""
+    profiler.enabled = self.auto_apply_profiling_enabled
+
+def start_trace(scene):
+    """Начинает запись трассы в файл из настроек сцены"""
+    path = bpy.path.abspath(scene.auto_apply_trace_path)
+    try:
+        trace_recorder.start(path, scene)
+    except OSError as e:
+        print(f"Auto Apply Scale: не удалось открыть файл трассы {path}: {e}")
+
+def update_trace_enabled(self, context):
+    """Включает или выключает запись трассы событий"""
+    if self.auto_apply_trace_enabled:
+        start_trace(self)
+    else:
+        trace_recorder.stop()
+
+@persistent
+def auto_apply_scale_depsgraph_update(scene, depsgraph):
+    """Передает обновления depsgraph трекерам слоя просмотра, для которого он построен.
+
+    Пока в сцене ничего не меняется, хэндлер не вызывается, поэтому
+    простаивающая сцена не тратит время на отслеживание масштаба.
+    Обновление включенной сцены без трекера (окно переключили на нее) или
+    с изменившимся набором окон (открыто новое окно) откладывает
+    синхронизацию реестра.
+    """
+    if is_scene_enabled(scene) and tracker_registry.windows_changed():
+        tracker_registry.schedule_sync()
+    trackers = tracker_registry.for_scene(scene, depsgraph.view_layer)
+    if not trackers:
+        if is_scene_enabled(scene):
+            tracker_registry.schedule_sync()
+        return
+    for operator in trackers:
+        try:
+            operator.on_depsgraph_update(depsgraph)
+        except ReferenceError:
+            # Оператор уже завершен, а ссылка на него осталась
+            tracker_registry.remove(operator)
 
 @persistent
 def auto_apply_scale_load_post(dummy):
@@ -29,18 +117,17 @@ def auto_apply_scale_load_post(dummy):
     
     При загрузке файла Blender восстанавливает свойства сцены, но не вызывает
     update-коллбэки BoolProperty, поэтому modal-оператор нужно запускать вручную.
+    Настройки сцены применяются сразу, а трекеры запускаются, как только
+    окна нового файла готовы (см. TrackerRegistry.start_when_ready).
     """
-    def delayed_start():
-        try:
-            reset_auto_apply_scale_status()
-            scene = bpy.context.scene
-            if (scene
-                    and getattr(scene, 'auto_apply_scale_enabled', False)
-                    and getattr(scene, 'auto_apply_scale', False)):
-                if bpy.context.mode == 'OBJECT':
-                    bpy.ops.object.auto_apply_scale('INVOKE_DEFAULT')
-        except Exception:
-            pass
-        return None  # однократный таймер
-
-    bpy.app.timers.register(delayed_start, first_interval=1.0)
+    invalidate_enabled_types()
+    # Трекеры прежнего файла завершены вместе с его окнами
+    reset_auto_apply_scale_status()
+
+    scene = bpy.context.scene
+    if scene:
+        profiler.enabled = getattr(scene, 'auto_apply_profiling_enabled', False)
+        trace_recorder.stop()
+        if getattr(scene, 'auto_apply_trace_enabled', False):
+            start_trace(scene)
+    tracker_registry.start_when_ready('load_post')